@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from protobug._cache import DecodeCache
+from protobug._columnar import Columns
+from protobug._columnar import dumps_columnar
+from protobug._columnar import loads_columnar
 from protobug._core import MISSING
 from protobug._core import Bool
 from protobug._core import Bytes
@@ -25,47 +29,109 @@ from protobug._core import field
 from protobug._core import message
 from protobug._core import signed_to_zigzag
 from protobug._core import zigzag_to_signed
+from protobug._decoder import Decoder
+from protobug._delta import apply
+from protobug._delta import diff
+from protobug._events import EventMarker
+from protobug._events import iter_events
+from protobug._index import FieldIndex
+from protobug._index import build_index
+from protobug._instrument import Instrumentation
+from protobug._instrument import TypeStats
+from protobug._instrument import disable_instrumentation
+from protobug._instrument import enable_instrumentation
+from protobug._instrument import get_instrumentation
+from protobug._json import from_dict
+from protobug._json import iter_json
+from protobug._json import to_dict
+from protobug._json import to_json
+from protobug._lazy import LazyList
 from protobug._reader import Reader
 from protobug._reader import load
+from protobug._reader import load_path
 from protobug._reader import loads
+from protobug._records import RecordReader
+from protobug._records import RecordWriter
+from protobug._records import register_codec
+from protobug._rewrite import rewrite
+from protobug._size import byte_size
+from protobug._tree import RawField
+from protobug._tree import loads_tree
+from protobug._tree import looks_like_message
 from protobug._version import __version__
 from protobug._version import __version_tuple__
 from protobug._writer import Writer
 from protobug._writer import dump
+from protobug._writer import dump_into
 from protobug._writer import dumps
+from protobug._writer import dumps_chunks
+from protobug._writer import dumps_many
 
 __all__ = [
     "MISSING",
     "Bool",
     "Bytes",
+    "Columns",
+    "DecodeCache",
+    "Decoder",
     "Double",
     "Enum",
+    "EventMarker",
+    "FieldIndex",
     "Fixed32",
     "Fixed64",
     "Float",
+    "Instrumentation",
     "Int32",
     "Int64",
+    "LazyList",
     "ProtoConversionInfo",
     "ProtoMode",
     "ProtoType",
+    "RawField",
     "Reader",
+    "RecordReader",
+    "RecordWriter",
     "SFixed32",
     "SFixed64",
     "SInt32",
     "SInt64",
     "String",
+    "TypeStats",
     "UInt32",
     "UInt64",
     "WireType",
     "Writer",
     "__version__",
     "__version_tuple__",
+    "apply",
+    "build_index",
+    "byte_size",
+    "diff",
+    "disable_instrumentation",
     "dump",
+    "dump_into",
     "dumps",
+    "dumps_chunks",
+    "dumps_columnar",
+    "dumps_many",
+    "enable_instrumentation",
     "field",
+    "from_dict",
+    "get_instrumentation",
+    "iter_events",
+    "iter_json",
     "load",
+    "load_path",
     "loads",
+    "loads_columnar",
+    "loads_tree",
+    "looks_like_message",
     "message",
+    "register_codec",
+    "rewrite",
     "signed_to_zigzag",
+    "to_dict",
+    "to_json",
     "zigzag_to_signed",
 ]
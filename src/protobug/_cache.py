@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import collections
+import threading
+import typing
+
+from protobug._core import _FROZEN_NAME
+
+if typing.TYPE_CHECKING:
+    T = typing.TypeVar("T")
+
+
+class DecodeCache:
+    def __init__(self, /, max_bytes: int = 1 << 24):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: collections.OrderedDict[tuple[type, bytes], typing.Any] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def clear(self, /) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _load(
+        self,
+        data: bytes | bytearray | memoryview,
+        py_type: type[T],
+        load: typing.Callable[[], T],
+        /,
+    ) -> T:
+        if not getattr(py_type, _FROZEN_NAME, False):
+            msg = f"decode cache needs a frozen message type, got {py_type}"
+            raise TypeError(msg)
+
+        key = (py_type, bytes(data))
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = load()
+        size = len(key[1])
+        if size > self.max_bytes:
+            return result
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = result
+                self._size += size
+            # evict the least recently used payloads
+            while self._size > self.max_bytes:
+                (_, evicted), _ = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+        return result
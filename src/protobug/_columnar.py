@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import array
+import dataclasses
+import io
+import typing
+
+from protobug._core import _NAME_LOOKUP_NAME
+from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import _SLOT_ARGS
+from protobug._core import ProtoMode
+from protobug._core import ProtoType
+from protobug._core import _RawString
+from protobug._reader import Reader
+from protobug._writer import Writer
+from protobug._writer import _BufferWriter
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoConversionInfo
+
+_TYPECODES = {
+    ProtoType.Int32: "q",
+    ProtoType.Int64: "q",
+    ProtoType.UInt32: "Q",
+    ProtoType.UInt64: "Q",
+    ProtoType.Enum: "q",
+    ProtoType.SInt32: "q",
+    ProtoType.SInt64: "q",
+    ProtoType.Fixed32: "Q",
+    ProtoType.SFixed32: "q",
+    ProtoType.Fixed64: "Q",
+    ProtoType.SFixed64: "q",
+    ProtoType.Bool: "B",
+    ProtoType.Float: "f",
+    ProtoType.Double: "d",
+}
+
+
+@dataclasses.dataclass(**_SLOT_ARGS)
+class Columns:
+    length: int
+    values: dict[str, array.array | list]
+    present: dict[str, bytearray]
+
+
+def _new_column(info: ProtoConversionInfo) -> array.array | list:
+    typecode = _TYPECODES.get(info.proto_type)
+    if typecode is None or info.proto_mode.is_multiple():
+        return []
+    return array.array(typecode)
+
+
+def _from_column(
+    info: ProtoConversionInfo, column: array.array | list, /
+) -> typing.Callable[[typing.Any], typing.Any] | None:
+    # typed arrays only keep the numbers
+    if not isinstance(column, array.array):
+        return None
+    if info.proto_type is ProtoType.Bool:
+        return bool
+    if info.proto_type is ProtoType.Enum:
+        return info.py_type
+    return None
+
+
+def loads_columnar(
+    payloads: typing.Iterable[bytes | bytearray | memoryview], py_type: type, /
+) -> Columns:
+    schema: dict[int, ProtoConversionInfo] | None = getattr(
+        py_type, _PID_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    fields = {field.name: field for field in dataclasses.fields(py_type)}
+    infos = list(schema.values())
+    values = {info.name: _new_column(info) for info in infos}
+    present = {
+        info.name: bytearray()
+        for info in infos
+        if info.proto_mode is ProtoMode.Optional
+    }
+
+    length = 0
+    for payload in payloads:
+        with io.BytesIO(payload) as buffer:
+            _, named_result, _ = Reader(buffer)._read_fields(schema, None)
+
+        for info in infos:
+            column = values[info.name]
+            value = named_result.get(info.name, dataclasses.MISSING)
+            if type(value) is _RawString:
+                value = value.decode()
+            if value is not dataclasses.MISSING:
+                if info.proto_mode is ProtoMode.Optional:
+                    present[info.name].append(1)
+                column.append(value)
+                continue
+
+            field = fields[info.name]
+            if field.default is not dataclasses.MISSING:
+                value = field.default
+            elif callable(field.default_factory):
+                value = field.default_factory()
+            else:
+                msg = f"{py_type.__qualname__}: missing required field {info.name!r}"
+                raise TypeError(msg)
+
+            if info.proto_mode is ProtoMode.Optional:
+                present[info.name].append(0)
+            if value is None and isinstance(column, array.array):
+                value = 0
+            column.append(value)
+
+        length += 1
+
+    return Columns(length, values, present)
+
+
+def dumps_columnar(
+    columns: Columns, py_type: type, /, *, trusted: bool = False
+) -> tuple[bytearray, array.array]:
+    schema: dict[str, ProtoConversionInfo] | None = getattr(
+        py_type, _NAME_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    fields = []
+    for field in dataclasses.fields(py_type):
+        info = schema[field.name]
+        column = columns.values[field.name]
+        fields.append((info, field.default, column, _from_column(info, column)))
+
+    buffer = bytearray()
+    offsets = array.array("Q", [0])
+    writer = Writer(
+        typing.cast("io.BufferedIOBase", _BufferWriter(buffer)), trusted=trusted
+    )
+    for index in range(columns.length):
+        for conversion_info, default, column, convert in fields:
+            present = columns.present.get(conversion_info.name)
+            if present is not None and not present[index]:
+                continue
+            value = column[index]
+            if convert is not None:
+                value = convert(value)
+            writer._write_field(conversion_info, default, value)
+
+        offsets.append(len(buffer))
+
+    return buffer, offsets
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import copy
 import dataclasses
 import enum
+import functools
 import inspect
 import struct
 import sys
@@ -12,10 +14,16 @@ if sys.version_info >= (3, 14):
     import annotationlib
 
 import protobug
+from protobug._lazy import LazyList
+from protobug._tracking import _UNTRACKED_NAMES
+from protobug._tracking import _setattr
 
 _METADATA_TAG_NAME = f"__{protobug.__name__}_metadata"
 _PID_LOOKUP_NAME = f"__{protobug.__name__}_pid_lookup"
 _NAME_LOOKUP_NAME = f"__{protobug.__name__}_name_lookup"
+_METADATA_LAZY_NAME = f"__{protobug.__name__}_lazy"
+_CACHE_ENCODING_NAME = f"__{protobug.__name__}_cache_encoding"
+_FROZEN_NAME = f"__{protobug.__name__}_frozen"
 
 _SLOT_ARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
@@ -137,6 +145,47 @@ class ProtoConversionInfo:
     py_type: type
     proto_type: ProtoType
     proto_mode: ProtoMode
+    lazy: bool = False
+
+
+class _RawString(bytes):
+    __slots__ = ()
+
+
+class _LazyString:
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str, /):
+        self._name = name
+
+    def __get__(self, instance: typing.Any, owner: type | None = None) -> typing.Any:
+        if instance is None:
+            return self
+        value = instance.__dict__[self._name]
+        if type(value) is _RawString:
+            # decode once and keep the result
+            value = instance.__dict__[self._name] = value.decode()
+        return value
+
+    def __set__(self, instance: typing.Any, value: typing.Any) -> None:
+        instance.__dict__[self._name] = value
+
+
+class _FrozenDict(dict):
+    __slots__ = ()
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return _FrozenDict, (dict(self),)
+
+    def _immutable(self, *args: typing.Any, **kwargs: typing.Any) -> typing.NoReturn:
+        msg = f"{type(self).__name__!r} object is immutable"
+        raise TypeError(msg)
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
 
 
 class _MapBase:
@@ -148,25 +197,34 @@ T = typing.TypeVar("T")
 
 
 @typing.overload
-def field(pid: int, /) -> typing.Any: ...
+def field(pid: int, /, *, lazy: bool = False) -> typing.Any: ...
 
 
 @typing.overload
-def field(pid: int, /, *, default: None) -> typing.Any: ...
+def field(pid: int, /, *, default: None, lazy: bool = False) -> typing.Any: ...
 
 
 @typing.overload
-def field(pid: int, /, *, default: T) -> T: ...
+def field(pid: int, /, *, default: T, lazy: bool = False) -> T: ...
 
 
 @typing.overload
-def field(pid: int, /, *, default_factory: typing.Callable[[], T]) -> T: ...
+def field(
+    pid: int, /, *, default_factory: typing.Callable[[], T], lazy: bool = False
+) -> T: ...
 
 
 def field(
-    pid: int, /, *, default: typing.Any = MISSING, default_factory: typing.Any = MISSING
+    pid: int,
+    /,
+    *,
+    default: typing.Any = MISSING,
+    default_factory: typing.Any = MISSING,
+    lazy: bool = False,
 ) -> typing.Any:
-    metadata = {_METADATA_TAG_NAME: pid}
+    metadata: dict[str, typing.Any] = {_METADATA_TAG_NAME: pid}
+    if lazy:
+        metadata[_METADATA_LAZY_NAME] = True
     if default is not MISSING:
         return dataclasses.field(default=default, metadata=metadata)
     if default_factory is not MISSING:
@@ -174,6 +232,72 @@ def field(
     return dataclasses.field(metadata=metadata)
 
 
+def _varint_size(value: int, /) -> int:
+    return ((value.bit_length() - 1) // 7 + 1) or 1
+
+
+def _encode_varint(value: int, /) -> bytearray:
+    size = _varint_size(value)
+    buffer = bytearray(size)
+
+    for i in range(size - 1):
+        buffer[i] = (value & 0b0111_1111) | 0b1000_0000
+        value >>= 7
+
+    buffer[-1] = value
+    return buffer
+
+
+def _encode_padded_varint(value: int, size: int, /) -> bytearray:
+    result = bytearray(size)
+    for index in range(size - 1):
+        result[index] = value & 0b0111_1111 | 0b1000_0000
+        value >>= 7
+    result[-1] = value
+    return result
+
+
+def _decode_varint(data: bytes | memoryview, position: int, /) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            msg = "expected another byte but reached EOF"
+            raise ValueError(msg)
+
+        byte = data[position]
+        position += 1
+        result |= (byte & 0b0111_1111) << shift
+        if not byte & 0b1000_0000:
+            return result, position
+        shift += 7
+
+
+def _skip_value(
+    data: bytes | memoryview, position: int, wire_type: WireType, /
+) -> tuple[int, int]:
+    # returns the start and end of the value payload
+    if wire_type is WireType.VARINT:
+        _, end = _decode_varint(data, position)
+        return position, end
+
+    if wire_type is WireType.I64:
+        end = position + 8
+    elif wire_type is WireType.I32:
+        end = position + 4
+    elif wire_type is WireType.LEN:
+        length, position = _decode_varint(data, position)
+        end = position + length
+    else:
+        msg = f"{wire_type.name} is deprecated and not implemented"
+        raise NotImplementedError(msg)
+
+    if end > len(data):
+        msg = f"not enough data: expected {end - position}, got {len(data) - position}"
+        raise ValueError(msg)
+    return position, end
+
+
 def zigzag_to_signed(value: int) -> int:
     result = value >> 1
     if value & 1:
@@ -268,14 +392,44 @@ def _forward_eval_hints(cls: type) -> dict[str, type]:
     return typing.get_type_hints(cls, globalns, localns, include_extras=True)
 
 
+@typing.overload
+def message(source: type, /) -> typing.Any: ...
+
+
+@typing.overload
+def message(
+    source: None = None,
+    /,
+    *,
+    pickle: bool = True,
+    cache_encoding: bool = False,
+    frozen: bool = False,
+) -> typing.Callable[[type], typing.Any]: ...
+
+
 @typing.dataclass_transform(field_specifiers=(field,))
-def message(source: type) -> typing.Any:
+def message(
+    source: type | None = None,
+    /,
+    *,
+    pickle: bool = True,
+    cache_encoding: bool = False,
+    frozen: bool = False,
+) -> typing.Any:
+    if source is None:
+        # the hint evaluation relies on being called from the class scope
+        return functools.partial(
+            message, pickle=pickle, cache_encoding=cache_encoding, frozen=frozen
+        )
+
     pid_lookup: dict[int, ProtoConversionInfo] = {}
     name_lookup: dict[str, ProtoConversionInfo] = {}
     setattr(source, _PID_LOOKUP_NAME, pid_lookup)
     setattr(source, _NAME_LOOKUP_NAME, name_lookup)
 
-    datacls: type = dataclasses.dataclass()(source)
+    if frozen:
+        setattr(source, "__post_init__", _freeze(vars(source).get("__post_init__")))
+    datacls: type = dataclasses.dataclass(frozen=frozen)(source)
     hints = _forward_eval_hints(source)
     for field in dataclasses.fields(datacls):
         pid = field.metadata.get(_METADATA_TAG_NAME)
@@ -303,15 +457,161 @@ def message(source: type) -> typing.Any:
         ):
             proto_mode = ProtoMode.Optional
 
+        lazy = typing.get_origin(hints[field.name]) is LazyList
+        if field.metadata.get(_METADATA_LAZY_NAME):
+            if proto_type is not ProtoType.String or proto_mode.is_multiple():
+                msg = f"{source.__qualname__}.{field.name}: lazy decoding needs a single String field"
+                raise TypeError(msg)
+            lazy = True
+            setattr(datacls, field.name, _LazyString(field.name))
+
         conversion_info = ProtoConversionInfo(
-            pid, field.name, py_type, proto_type, proto_mode
+            pid, field.name, py_type, proto_type, proto_mode, lazy
         )
         pid_lookup[pid] = conversion_info
         name_lookup[field.name] = conversion_info
 
+    if pickle and "__reduce__" not in vars(source):
+        setattr(datacls, "__reduce__", _reduce)
+        # copies keep the fields themselves instead of going through `__reduce__`
+        if "__copy__" not in vars(source):
+            setattr(datacls, "__copy__", _copy)
+        if "__deepcopy__" not in vars(source):
+            setattr(datacls, "__deepcopy__", _deepcopy)
+
+    if frozen:
+        for info in pid_lookup.values():
+            _check_frozen(source, info)
+        setattr(datacls, _FROZEN_NAME, True)
+
+    if cache_encoding:
+        for info in pid_lookup.values():
+            _check_cacheable(source, info)
+        setattr(datacls, _CACHE_ENCODING_NAME, True)
+        # frozen instances never have to invalidate their encoding
+        if not frozen:
+            setattr(datacls, "__setattr__", _setattr)
+
     return datacls
 
 
+def _freeze(post_init: typing.Any, /) -> typing.Callable[..., None]:
+    def __post_init__(self: typing.Any, *args: typing.Any) -> None:
+        for name, value in list(vars(self).items()):
+            if type(value) is list:
+                object.__setattr__(self, name, tuple(value))
+            elif type(value) is dict:
+                object.__setattr__(self, name, _FrozenDict(value))
+        if post_init is not None:
+            post_init(self, *args)
+
+    return __post_init__
+
+
+def _check_frozen(source: type, info: ProtoConversionInfo, /) -> None:
+    if info.proto_type is not ProtoType.Embed:
+        return
+    if info.lazy:
+        msg = f"{source.__qualname__}.{info.name}: LazyList cannot be frozen"
+        raise TypeError(msg)
+
+    py_type = info.py_type
+    if issubclass(py_type, _MapBase):
+        value_info = getattr(py_type, _NAME_LOOKUP_NAME)["value"]
+        if value_info.proto_type is not ProtoType.Embed:
+            return
+        py_type = value_info.py_type
+
+    # a mutable nested message would make the parent mutable too
+    if not getattr(py_type, _FROZEN_NAME, False):
+        msg = f"{source.__qualname__}.{info.name}: {py_type.__qualname__} needs frozen as well"
+        raise TypeError(msg)
+
+
+def _check_cacheable(source: type, info: ProtoConversionInfo, /) -> None:
+    if info.proto_type is not ProtoType.Embed:
+        return
+    if info.lazy:
+        msg = f"{source.__qualname__}.{info.name}: LazyList cannot be tracked for cached encodings"
+        raise TypeError(msg)
+
+    py_type = info.py_type
+    if issubclass(py_type, _MapBase):
+        value_info = getattr(py_type, _NAME_LOOKUP_NAME)["value"]
+        if value_info.proto_type is not ProtoType.Embed:
+            return
+        py_type = value_info.py_type
+
+    # changes to nested messages have to reach the cached parent
+    if not getattr(py_type, _CACHE_ENCODING_NAME, False):
+        msg = f"{source.__qualname__}.{info.name}: {py_type.__qualname__} needs cache_encoding as well"
+        raise TypeError(msg)
+
+
+def _reduce(self: typing.Any) -> tuple[typing.Any, ...]:
+    py_type: type = type(self)
+    try:
+        data = protobug.dumps(self)
+    except (TypeError, ValueError):
+        data = None
+
+    # pickle through the wire format, which also keeps unknown fields,
+    # unless the message cannot be encoded or Float values lose precision
+    if data is not None and (
+        not _has_float(py_type) or protobug.loads(data, py_type) == self
+    ):
+        return protobug.loads, (data, py_type)
+
+    state = vars(self)
+    named_result = {
+        info.name: state[info.name]
+        for info in getattr(py_type, _NAME_LOOKUP_NAME).values()
+    }
+    return protobug._reader._create, (py_type, named_result, state.get("_unknown", b""))
+
+
+@functools.cache
+def _has_float(py_type: type, /) -> bool:
+    seen = {py_type}
+    stack = [py_type]
+    while stack:
+        for info in getattr(stack.pop(), _NAME_LOOKUP_NAME).values():
+            if info.proto_type is ProtoType.Float:
+                return True
+            if info.proto_type is ProtoType.Embed and info.py_type not in seen:
+                seen.add(info.py_type)
+                stack.append(info.py_type)
+    return False
+
+
+def _copy(self: typing.Any) -> typing.Any:
+    return _copy_state(self, lambda value: value)
+
+
+def _deepcopy(self: typing.Any, memo: dict[int, typing.Any]) -> typing.Any:
+    return _copy_state(self, lambda value: copy.deepcopy(value, memo), memo)
+
+
+def _copy_state(
+    value: typing.Any,
+    copier: typing.Callable[[typing.Any], typing.Any],
+    memo: dict[int, typing.Any] | None = None,
+    /,
+) -> typing.Any:
+    py_type = type(value)
+    result = object.__new__(py_type)
+    if memo is not None:
+        memo[id(value)] = result
+
+    # tracked containers have to belong to the copy
+    setter = _setattr if py_type.__setattr__ is _setattr else object.__setattr__
+    for name, item in vars(value).items():
+        # a cached encoding is only invalidated through the original
+        if name not in _UNTRACKED_NAMES:
+            setter(result, name, copier(item))
+    return result
+
+
 _NON_PACKABLE_TYPES = (ProtoType.Bytes, ProtoType.String, ProtoType.Embed)
 
 
@@ -334,7 +634,7 @@ def _resolve_type(py_type: type) -> tuple[type, ProtoType, ProtoMode]:
 
             py_type = args[args[0] is type(None)]
             origin = typing.get_origin(py_type)
-            if origin in (list, dict):
+            if origin in (list, tuple, dict, LazyList):
                 msg = (
                     f"found optional {origin.__name__}, remove the optional annotation"
                 )
@@ -344,10 +644,22 @@ def _resolve_type(py_type: type) -> tuple[type, ProtoType, ProtoMode]:
             msg = f"cannot handle non optional union type annotation: {py_types}"
             raise NotImplementedError(msg)
 
-    # resolved subscribed types `list[T]` and `dict[T, U]`
-    if origin in (list, dict):
+    # decoding of `LazyList[T]` items is deferred until they are accessed
+    if origin is LazyList:
+        py_type, proto_type, _ = _resolve_type(typing.get_args(py_type)[0])
+        if proto_type is not ProtoType.Embed:
+            msg = f"LazyList needs a message type, got {proto_type.name}"
+            raise TypeError(msg)
+        return py_type, proto_type, ProtoMode.Repeated
+
+    # resolved subscribed types `list[T]`, `tuple[T, ...]` and `dict[T, U]`
+    if origin in (list, tuple, dict):
         args = typing.get_args(py_type)
-        if origin is list:
+        if origin is tuple and (len(args) != 2 or args[1] is not Ellipsis):
+            msg = f"only variadic tuples are supported, got {py_type}"
+            raise TypeError(msg)
+
+        if origin in (list, tuple):
             py_type, proto_type, _ = _resolve_type(args[0])
             if proto_type in _NON_PACKABLE_TYPES:
                 mode = ProtoMode.Repeated
@@ -377,7 +689,7 @@ def _resolve_type(py_type: type) -> tuple[type, ProtoType, ProtoMode]:
     elif dataclasses.is_dataclass(py_type):
         proto_type = ProtoType.Embed
 
-    elif py_type in (list, dict):
+    elif py_type in (list, tuple, dict):
         msg = f"missing specialization for {py_type}"
         raise TypeError(msg)
 
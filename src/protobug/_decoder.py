@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import typing
+
+from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import _SLOT_ARGS
+from protobug._core import ProtoType
+from protobug._core import WireType
+from protobug._core import _decode_varint
+from protobug._core import _skip_value
+from protobug._reader import Reader
+from protobug._reader import _attach
+from protobug._reader import _create
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoConversionInfo
+
+
+@dataclasses.dataclass(**_SLOT_ARGS)
+class _Frame:
+    # the field of the parent that the nested message is decoded into
+    info: ProtoConversionInfo
+    schema: dict[int, ProtoConversionInfo]
+    named_result: dict[str, typing.Any]
+    unknown: bytearray
+    # bytes left in the parent once the nested message is done
+    remaining: int | None
+
+
+class Decoder:
+    def __init__(self, py_type: type | None = None, /, *, delimited: bool = False):
+        self._schema: dict[int, ProtoConversionInfo] | None = None
+        if py_type is not None:
+            self._schema = getattr(py_type, _PID_LOOKUP_NAME, None)
+            if not self._schema:
+                msg = f"not a valid protobuf type: {py_type}"
+                raise TypeError(msg)
+
+        self._py_type = py_type
+        self._delimited = delimited
+        self._buffer = bytearray()
+        # bytes left in the current frame, `None` if the length is not known yet
+        self._remaining: int | None = None
+        # incomplete nested messages, innermost last
+        self._frames: list[_Frame] = []
+        self._reset()
+
+    def _reset(self, /) -> None:
+        self._result: dict[int, list] = {}
+        self._named_result: dict[str, typing.Any] = {}
+        self._unknown = bytearray()
+
+    def feed(self, data: bytes | bytearray | memoryview, /) -> list[typing.Any]:
+        self._buffer += data
+        messages = []
+        position = 0
+        with memoryview(self._buffer) as buffer:
+            while True:
+                if self._delimited and self._remaining is None and not self._frames:
+                    try:
+                        self._remaining, position = _decode_varint(buffer, position)
+                    except ValueError:
+                        break
+
+                limit = len(buffer)
+                if self._remaining is not None:
+                    limit = min(limit, position + self._remaining)
+
+                end = _complete_records(buffer[:limit], position)
+                if (
+                    self._remaining is not None
+                    and end != limit == position + self._remaining
+                ):
+                    msg = f"non matching data length: expected {self._remaining}, got {end - position}"
+                    raise ValueError(msg)
+
+                if end != position:
+                    self._decode(buffer[position:end])
+                    if self._remaining is not None:
+                        self._remaining -= end - position
+                    position = end
+
+                if self._remaining == 0 and self._frames:
+                    self._leave()
+                    continue
+
+                if self._remaining != 0:
+                    # resume inside a nested message instead of buffering it whole
+                    header = self._enter(buffer[:limit], position)
+                    if header is None:
+                        break
+                    position = header
+                    continue
+
+                messages.append(self._finish())
+
+        del self._buffer[:position]
+        return messages
+
+    def close(self, /) -> list[typing.Any]:
+        if self._frames:
+            msg = f"incomplete data: {len(self._frames)} nested messages left open"
+            raise ValueError(msg)
+
+        if self._buffer:
+            msg = f"incomplete data: {len(self._buffer)} bytes left over"
+            raise ValueError(msg)
+
+        if self._delimited:
+            if self._remaining is not None:
+                msg = f"incomplete frame: expected {self._remaining} more bytes"
+                raise ValueError(msg)
+            return []
+
+        return [self._finish()]
+
+    def _enter(self, data: memoryview, position: int, /) -> int | None:
+        # returns the start of the nested message if the record at position has one
+        if self._schema is None or position >= len(data):
+            return None
+        try:
+            tag, header = _decode_varint(data, position)
+            length, header = _decode_varint(data, header)
+        except ValueError:
+            return None
+
+        info = self._schema.get(tag >> 3)
+        if (
+            info is None
+            or tag & 0b111 != WireType.LEN
+            or info.proto_type is not ProtoType.Embed
+            or info.lazy
+        ):
+            return None
+
+        remaining = None
+        if self._remaining is not None:
+            remaining = self._remaining - (header - position) - length
+            if remaining < 0:
+                msg = f"non matching data length: expected {self._remaining}, got {header - position + length}"
+                raise ValueError(msg)
+
+        self._frames.append(
+            _Frame(info, self._schema, self._named_result, self._unknown, remaining)
+        )
+        self._schema = getattr(info.py_type, _PID_LOOKUP_NAME)
+        self._named_result = {}
+        self._unknown = bytearray()
+        self._remaining = length
+        return header
+
+    def _leave(self, /) -> None:
+        frame = self._frames.pop()
+        value: typing.Any = _create(
+            frame.info.py_type, self._named_result, self._unknown
+        )
+        self._schema = frame.schema
+        self._named_result = frame.named_result
+        self._unknown = frame.unknown
+        self._remaining = frame.remaining
+        _attach(self._named_result, frame.info, value)
+
+    def _decode(self, data: memoryview, /) -> None:
+        with io.BytesIO(data) as buffer:
+            Reader(buffer)._read_fields(
+                self._schema,
+                len(data),
+                self._result,
+                self._named_result,
+                self._unknown,
+            )
+
+    def _finish(self, /) -> typing.Any:
+        if self._py_type is None:
+            message: typing.Any = self._result
+        else:
+            message = _create(self._py_type, self._named_result, self._unknown)
+        self._remaining = None
+        self._reset()
+        return message
+
+
+def _complete_records(data: memoryview, position: int, /) -> int:
+    # returns the end of the last record that is fully contained in data
+    while position < len(data):
+        try:
+            tag, end = _decode_varint(data, position)
+        except ValueError:
+            break
+
+        # more data cannot fix an invalid tag
+        if tag & 0b111 not in WireType._value2member_map_:
+            msg = f"invalid wire type: {tag & 0b111}"
+            raise ValueError(msg)
+
+        try:
+            _, end = _skip_value(data, end, WireType(tag & 0b111))
+        except ValueError:
+            break
+        position = end
+
+    return position
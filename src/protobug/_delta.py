@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import typing
+
+from protobug._core import _NAME_LOOKUP_NAME
+from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import Bool
+from protobug._core import Bytes
+from protobug._core import ProtoMode
+from protobug._core import ProtoType
+from protobug._core import UInt32
+from protobug._core import UInt64
+from protobug._core import _RawString
+from protobug._core import field
+from protobug._core import message
+from protobug._reader import Reader
+from protobug._reader import _create
+from protobug._reader import loads
+from protobug._rewrite import _encode_field
+from protobug._writer import dumps
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoConversionInfo
+
+    T = typing.TypeVar("T")
+
+
+@message
+class _Change:
+    pid: UInt32 = field(1)
+    # records of the field as they would appear in the message itself
+    value: typing.Union[Bytes, None] = field(2, default=None)
+    clear: typing.Union[Bool, None] = field(3, default=None)
+    # number of repeated items to keep before appending `value`
+    truncate: typing.Union[UInt64, None] = field(4, default=None)
+    # map entries whose keys are removed
+    removed: typing.Union[Bytes, None] = field(5, default=None)
+    # an encoded `_Delta` for the submessage
+    nested: typing.Union[Bytes, None] = field(6, default=None)
+
+
+@message
+class _Delta:
+    changes: list[_Change] = field(1, default_factory=list)
+    unknown: typing.Union[Bytes, None] = field(2, default=None)
+
+
+def diff(old: typing.Any, new: typing.Any, /) -> bytes:
+    return dumps(_diff(old, new))
+
+
+def _diff(old: typing.Any, new: typing.Any, /) -> _Delta:
+    py_type = type(old)
+    schema: dict[str, ProtoConversionInfo] | None = getattr(
+        py_type, _NAME_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+    if type(new) is not py_type:
+        msg = f"cannot diff {py_type.__qualname__} with {type(new).__qualname__}"
+        raise TypeError(msg)
+
+    delta = _Delta()
+    for info in schema.values():
+        old_value = _get(old, info)
+        new_value = _get(new, info)
+        change = _Change(info.pid)
+
+        if isinstance(new_value, dict):
+            removed = {key: None for key in old_value if key not in new_value}
+            upserts = {
+                key: value
+                for key, value in new_value.items()
+                if key not in old_value or old_value[key] != value
+            }
+            if removed:
+                change.removed = bytes(_encode_field(info, removed))
+            if upserts:
+                change.value = bytes(_encode_field(info, upserts))
+
+        elif info.proto_mode.is_multiple():
+            prefix = 0
+            for old_item, new_item in zip(old_value, new_value):
+                if old_item != new_item:
+                    break
+                prefix += 1
+            if prefix < len(old_value):
+                change.truncate = prefix
+            if prefix < len(new_value):
+                change.value = bytes(_encode_field(info, new_value[prefix:]))
+
+        elif old_value == new_value:
+            continue
+
+        elif new_value is None or (
+            info.proto_mode is ProtoMode.Optional
+            and new_value == _default(py_type, info)
+        ):
+            change.clear = True
+
+        elif info.proto_type is ProtoType.Embed and old_value is not None:
+            nested = _diff(old_value, new_value)
+            if nested.changes or nested.unknown is not None:
+                change.nested = dumps(nested)
+
+        else:
+            change.value = bytes(_encode_field(info, new_value))
+
+        if change != _Change(info.pid):
+            delta.changes.append(change)
+
+    old_unknown = getattr(old, "_unknown", b"")
+    new_unknown = getattr(new, "_unknown", b"")
+    if old_unknown != new_unknown:
+        delta.unknown = new_unknown
+
+    return delta
+
+
+def apply(old: T, delta: bytes | bytearray | memoryview, /) -> T:
+    return _apply(old, loads(delta, _Delta))
+
+
+def _apply(old: T, delta: _Delta, /) -> T:
+    py_type = type(old)
+    schema: dict[int, ProtoConversionInfo] | None = getattr(
+        py_type, _PID_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    values = {info.name: _get(old, info) for info in schema.values()}
+    for change in delta.changes:
+        info = schema.get(change.pid)
+        if info is None:
+            msg = f"{py_type.__qualname__}: unknown field id: {change.pid}"
+            raise ValueError(msg)
+
+        value = values[info.name]
+        if change.clear:
+            values[info.name] = _default(py_type, info)
+
+        elif change.nested is not None:
+            values[info.name] = _apply(value, loads(change.nested, _Delta))
+
+        elif isinstance(value, dict):
+            value = dict(value)
+            if change.removed is not None:
+                for key in _decode_field(schema, info, change.removed):
+                    del value[key]
+            if change.value is not None:
+                value.update(_decode_field(schema, info, change.value))
+            values[info.name] = value
+
+        elif info.proto_mode.is_multiple():
+            value = list(value)
+            if change.truncate is not None:
+                del value[change.truncate :]
+            if change.value is not None:
+                value.extend(_decode_field(schema, info, change.value))
+            values[info.name] = value
+
+        elif change.value is not None:
+            values[info.name] = _decode_field(schema, info, change.value)
+
+    unknown = getattr(old, "_unknown", b"") if delta.unknown is None else delta.unknown
+    return _create(py_type, values, bytearray(unknown))
+
+
+def _get(value: typing.Any, info: ProtoConversionInfo, /) -> typing.Any:
+    # lazy values are read without storing the decoded result on the message
+    field_value = vars(value)[info.name] if info.lazy else getattr(value, info.name)
+    if type(field_value) is _RawString:
+        return field_value.decode()
+    return field_value
+
+
+def _default(py_type: type, info: ProtoConversionInfo, /) -> typing.Any:
+    for item in dataclasses.fields(py_type):
+        if item.name == info.name:
+            if item.default_factory is not dataclasses.MISSING:
+                return item.default_factory()
+            return item.default
+    msg = f"{py_type.__qualname__}: unknown field: {info.name}"
+    raise ValueError(msg)
+
+
+def _decode_field(
+    schema: dict[int, ProtoConversionInfo],
+    info: ProtoConversionInfo,
+    data: bytes,
+    /,
+) -> typing.Any:
+    with io.BytesIO(data) as buffer:
+        _, named_result, _ = Reader(buffer)._read_fields(schema, None)
+    if info.name not in named_result:
+        msg = f"missing value for {info.name}"
+        raise ValueError(msg)
+    return named_result[info.name]
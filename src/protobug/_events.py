@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import enum
+import typing
+
+from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import ProtoType
+from protobug._core import WireType
+from protobug._core import _decode_varint
+from protobug._core import _skip_value
+from protobug._reader import _convert
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoConversionInfo
+
+
+class EventMarker(enum.Enum):
+    # entering and leaving an embedded message, the value is the message type
+    START = enum.auto()
+    END = enum.auto()
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}.{self.name}"
+
+
+Event = tuple[int, typing.Union[WireType, EventMarker], typing.Any]
+
+
+def iter_events(
+    data: bytes | bytearray | memoryview, py_type: type | None = None, /
+) -> typing.Iterator[Event]:
+    schema: dict[int, ProtoConversionInfo] | None = None
+    if py_type is not None:
+        schema = getattr(py_type, _PID_LOOKUP_NAME, None)
+        if not schema:
+            msg = f"not a valid protobuf type: {py_type}"
+            raise TypeError(msg)
+
+    data = memoryview(data)
+    position = 0
+    end = len(data)
+    stack: list[tuple[int, int, dict[int, ProtoConversionInfo] | None, type]] = []
+    while True:
+        if position == end:
+            if not stack:
+                return
+            pid, end, schema, sub_type = stack.pop()
+            yield pid, EventMarker.END, sub_type
+            continue
+
+        tag, position = _decode_varint(data, position)
+        pid, wire_type = tag >> 3, WireType(tag & 0b111)
+        start, position = _skip_value(data, position, wire_type)
+        if position > end:
+            msg = f"not enough data: expected {position - start}, got {end - start}"
+            raise ValueError(msg)
+
+        info = schema.get(pid) if schema is not None else None
+        if info is None:
+            if wire_type is WireType.VARINT:
+                value: typing.Any = _decode_varint(data, start)[0]
+            elif wire_type is WireType.LEN:
+                value = data[start:position]
+            else:
+                value = bytes(data[start:position])
+            yield pid, wire_type, value
+            continue
+
+        proto_type = info.proto_type
+        expected_wire_type = proto_type.wire_type()
+        if proto_type is ProtoType.Embed and wire_type is WireType.LEN:
+            stack.append((pid, end, schema, info.py_type))
+            schema = getattr(info.py_type, _PID_LOOKUP_NAME)
+            end = position
+            position = start
+            yield pid, EventMarker.START, info.py_type
+            continue
+
+        if wire_type is expected_wire_type:
+            yield pid, wire_type, _scalar(data, start, position, info)
+            continue
+
+        if wire_type is not WireType.LEN or not info.proto_mode.is_multiple():
+            msg = (
+                f"unexpected value type for {info.name}: "
+                f"expected {expected_wire_type}, got {wire_type}"
+            )
+            raise ValueError(msg)
+
+        # packed values are reported one by one
+        item = start
+        while item < position:
+            item_start, item = _skip_value(data, item, expected_wire_type)
+            yield pid, expected_wire_type, _scalar(data, item_start, item, info)
+
+        if item != position:
+            msg = f"non-matching packed length: expected {position - start}, got {item - start}"
+            raise ValueError(msg)
+
+
+def _scalar(
+    data: memoryview, start: int, end: int, info: ProtoConversionInfo, /
+) -> typing.Any:
+    proto_type = info.proto_type
+    if proto_type in (ProtoType.String, ProtoType.Bytes):
+        # keep the span, decoding is left to the consumer
+        return data[start:end]
+
+    wire_type = proto_type.wire_type()
+    if wire_type is WireType.VARINT:
+        value: int | bytes = _decode_varint(data, start)[0]
+    else:
+        value = bytes(data[start:end])
+    return _convert(value, proto_type, info.py_type)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import struct
+import typing
+
+from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import ProtoType
+from protobug._core import WireType
+from protobug._core import _decode_varint
+from protobug._core import _skip_value
+from protobug._reader import _convert
+
+if typing.TYPE_CHECKING:
+    import types
+
+    from typing_extensions import Self
+
+    from protobug._core import ProtoConversionInfo
+    from protobug._records import RecordReader
+
+_MAGIC = b"PBI2"
+# magic, key format and entry count
+_HEADER = struct.Struct("<4ss3xQ")
+# start and end in the key blob, and the record number
+_VARIABLE_ENTRY = struct.Struct("<QQQ")
+
+# the key format follows the values `loads` produces for each type
+_KEY_FORMATS = {
+    ProtoType.Int32: "q",
+    ProtoType.Int64: "q",
+    ProtoType.UInt32: "Q",
+    ProtoType.UInt64: "Q",
+    ProtoType.Enum: "q",
+    ProtoType.SInt32: "q",
+    ProtoType.SInt64: "q",
+    ProtoType.Fixed32: "Q",
+    ProtoType.Fixed64: "Q",
+    ProtoType.SFixed32: "q",
+    ProtoType.SFixed64: "q",
+    ProtoType.Bool: "q",
+    ProtoType.Float: "d",
+    ProtoType.Double: "d",
+    # variable length keys are compared by their encoded bytes
+    ProtoType.String: "s",
+    ProtoType.Bytes: "y",
+}
+_VARIABLE_FORMATS = ("s", "y")
+
+
+def build_index(reader: RecordReader, pid: int, file: typing.BinaryIO, /) -> int:
+    schema: dict[int, ProtoConversionInfo] = getattr(reader._py_type, _PID_LOOKUP_NAME)
+    info = schema.get(pid)
+    if info is None:
+        msg = f"{reader._py_type.__qualname__}: unknown field id: {pid}"
+        raise ValueError(msg)
+    key_format = _KEY_FORMATS.get(info.proto_type)
+    if key_format is None:
+        msg = f"{reader._py_type.__qualname__}.{info.name}: cannot index {info.proto_type.name} field"
+        raise TypeError(msg)
+
+    entries: list[tuple[typing.Any, int]] = []
+    number = 0
+    for block in range(reader.block_count):
+        for record in reader._read_block(block):
+            entries.extend((value, number) for value in _extract(record, info))
+            number += 1
+    entries.sort()
+
+    file.write(_HEADER.pack(_MAGIC, key_format.encode(), len(entries)))
+    if key_format not in _VARIABLE_FORMATS:
+        entry = struct.Struct(f"<{key_format}Q")
+        for value, number in entries:
+            file.write(entry.pack(value, number))
+        return len(entries)
+
+    position = 0
+    for value, number in entries:
+        file.write(_VARIABLE_ENTRY.pack(position, position + len(value), number))
+        position += len(value)
+    for value, _ in entries:
+        file.write(value)
+    return len(entries)
+
+
+def _extract(data: memoryview, info: ProtoConversionInfo, /) -> list[typing.Any]:
+    expected_wire_type = info.proto_type.wire_type()
+    values = []
+    position = 0
+    while position < len(data):
+        tag, position = _decode_varint(data, position)
+        start, position = _skip_value(data, position, WireType(tag & 0b111))
+        if tag >> 3 != info.pid:
+            continue
+
+        if tag & 0b111 == expected_wire_type:
+            spans = [(start, position)]
+        elif tag & 0b111 == WireType.LEN and info.proto_mode.is_multiple():
+            spans = []
+            item = start
+            while item < position:
+                item_start, item = _skip_value(data, item, expected_wire_type)
+                spans.append((item_start, item))
+        else:
+            msg = (
+                f"unexpected value type for {info.name}: "
+                f"expected {expected_wire_type}, got {WireType(tag & 0b111)}"
+            )
+            raise ValueError(msg)
+
+        for item_start, item_end in spans:
+            value: int | bytes
+            if expected_wire_type is WireType.VARINT:
+                value = _decode_varint(data, item_start)[0]
+            else:
+                value = bytes(data[item_start:item_end])
+            if expected_wire_type is WireType.LEN:
+                values.append(value)
+            else:
+                values.append(_convert(value, info.proto_type))
+
+    return values
+
+
+class FieldIndex:
+    def __init__(self, source: str | os.PathLike[str] | bytes | bytearray, /):
+        self._mmap: mmap.mmap | None = None
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                if os.fstat(file.fileno()).st_size:
+                    self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            data = self._mmap if self._mmap is not None else b""
+        else:
+            data = bytes(source)
+        self._data: mmap.mmap | bytes = data
+
+        if len(data) < _HEADER.size:
+            self.close()
+            msg = "not a protobug index file"
+            raise ValueError(msg)
+
+        magic, key_format, self._count = _HEADER.unpack_from(data)
+        self._format = key_format.decode("ascii", "replace")
+        if magic != _MAGIC or self._format not in (*"qQd", *_VARIABLE_FORMATS):
+            self.close()
+            msg = "not a protobug index file"
+            raise ValueError(msg)
+
+        if self._format in _VARIABLE_FORMATS:
+            self._entry = _VARIABLE_ENTRY
+            self._blob = _HEADER.size + self._count * self._entry.size
+            truncated = self._blob > len(data) or (
+                self._count and self._key_span(self._count - 1)[1] > len(data)
+            )
+        else:
+            self._entry = struct.Struct(f"<{self._format}Q")
+            truncated = _HEADER.size + self._count * self._entry.size != len(data)
+        if truncated:
+            self.close()
+            msg = "truncated index file"
+            raise ValueError(msg)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key_span(self, index: int, /) -> tuple[int, int]:
+        start, end, _ = self._entry.unpack_from(
+            self._data, _HEADER.size + index * self._entry.size
+        )
+        return self._blob + start, self._blob + end
+
+    def _key(self, index: int, /) -> typing.Any:
+        if self._format in _VARIABLE_FORMATS:
+            start, end = self._key_span(index)
+            return self._data[start:end]
+        return self._entry.unpack_from(
+            self._data, _HEADER.size + index * self._entry.size
+        )[0]
+
+    def _records(self, start: int, stop: int, /) -> list[int]:
+        return [
+            self._entry.unpack_from(
+                self._data, _HEADER.size + index * self._entry.size
+            )[-1]
+            for index in range(start, stop)
+        ]
+
+    def _to_key(self, value: typing.Any, /) -> typing.Any:
+        if self._format == "s":
+            return value.encode()
+        if self._format == "y":
+            return bytes(value)
+        return value
+
+    def lookup(self, value: typing.Any, /) -> list[int]:
+        value = self._to_key(value)
+        entries = range(self._count)
+        start = bisect.bisect_left(entries, value, key=self._key)
+        stop = bisect.bisect_right(entries, value, lo=start, key=self._key)
+        return self._records(start, stop)
+
+    def lookup_range(
+        self, start: typing.Any = None, stop: typing.Any = None, /
+    ) -> list[int]:
+        if start is not None:
+            start = self._to_key(start)
+        if stop is not None:
+            stop = self._to_key(stop)
+        entries = range(self._count)
+        begin = (
+            0 if start is None else bisect.bisect_left(entries, start, key=self._key)
+        )
+        end = (
+            self._count
+            if stop is None
+            else bisect.bisect_left(entries, stop, lo=begin, key=self._key)
+        )
+        return self._records(begin, end)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import typing
+
+from protobug._core import _SLOT_ARGS
+
+Callback = typing.Callable[[str, type, int, int, int], None]
+
+
+@dataclasses.dataclass(**_SLOT_ARGS)
+class TypeStats:
+    calls: int = 0
+    bytes: int = 0
+    time_ns: int = 0
+    fields: int = 0
+    unknown_fields: int = 0
+    packed_elements: int = 0
+
+
+class Instrumentation:
+    _active: typing.ClassVar[Instrumentation | None] = None
+
+    def __init__(self, /) -> None:
+        self._lock = threading.Lock()
+        self.decode: dict[type, TypeStats] = {}
+        self.encode: dict[type, TypeStats] = {}
+        self.callbacks: list[Callback] = []
+
+    def record(
+        self,
+        kind: typing.Literal["decode", "encode"],
+        py_type: type,
+        size: int,
+        start_ns: int,
+        end_ns: int,
+        /,
+        *,
+        fields: int = 0,
+        unknown_fields: int = 0,
+        packed_elements: int = 0,
+    ) -> None:
+        counters = self.decode if kind == "decode" else self.encode
+        with self._lock:
+            stats = counters.get(py_type)
+            if stats is None:
+                stats = counters[py_type] = TypeStats()
+            stats.calls += 1
+            stats.bytes += size
+            stats.time_ns += end_ns - start_ns
+            stats.fields += fields
+            stats.unknown_fields += unknown_fields
+            stats.packed_elements += packed_elements
+
+        for callback in self.callbacks:
+            callback(kind, py_type, size, start_ns, end_ns)
+
+    def snapshot(self, /) -> dict[str, dict[str, TypeStats]]:
+        with self._lock:
+            return {
+                kind: {
+                    f"{py_type.__module__}.{py_type.__qualname__}": dataclasses.replace(
+                        stats
+                    )
+                    for py_type, stats in counters.items()
+                }
+                for kind, counters in (("decode", self.decode), ("encode", self.encode))
+            }
+
+    def reset(self, /) -> None:
+        with self._lock:
+            self.decode.clear()
+            self.encode.clear()
+
+
+def enable_instrumentation(
+    instrumentation: Instrumentation | None = None, /
+) -> Instrumentation:
+    if instrumentation is None:
+        instrumentation = Instrumentation._active or Instrumentation()
+    Instrumentation._active = instrumentation
+    return instrumentation
+
+
+def disable_instrumentation() -> Instrumentation | None:
+    instrumentation = Instrumentation._active
+    Instrumentation._active = None
+    return instrumentation
+
+
+def get_instrumentation() -> Instrumentation | None:
+    return Instrumentation._active
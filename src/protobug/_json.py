@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import dataclasses
+import json
+import math
+import typing
+
+import protobug
+from protobug._core import _NAME_LOOKUP_NAME
+from protobug._core import _SLOT_ARGS
+from protobug._core import ProtoMode
+from protobug._core import ProtoType
+from protobug._core import _MapBase
+from protobug._lazy import LazyList
+
+if typing.TYPE_CHECKING:
+    from protobug._core import Enum
+    from protobug._core import ProtoConversionInfo
+
+    T = typing.TypeVar("T")
+
+_JSON_LOOKUP_NAME = f"__{protobug.__name__}_json_lookup"
+
+_INT64_TYPES = (
+    ProtoType.Int64,
+    ProtoType.UInt64,
+    ProtoType.SInt64,
+    ProtoType.Fixed64,
+    ProtoType.SFixed64,
+)
+_INT_TYPES = (
+    ProtoType.Int32,
+    ProtoType.UInt32,
+    ProtoType.SInt32,
+    ProtoType.Fixed32,
+    ProtoType.SFixed32,
+    *_INT64_TYPES,
+)
+
+Converter = typing.Callable[[typing.Any], typing.Any]
+
+
+@dataclasses.dataclass(frozen=True, **_SLOT_ARGS)
+class _JsonField:
+    info: ProtoConversionInfo
+    json_name: str
+    default: typing.Any
+    to_json: Converter
+    from_json: Converter
+    key_to_json: Converter | None = None
+    key_from_json: Converter | None = None
+
+
+def _json_name(name: str, /) -> str:
+    first, *rest = name.split("_")
+    return first + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def _float_to_json(value: float, /) -> float | str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return value
+
+
+def _bytes_from_json(value: str, /) -> bytes:
+    # both the standard and the url safe alphabet are accepted
+    value = value.replace("-", "+").replace("_", "/")
+    try:
+        return base64.b64decode(value + "=" * (-len(value) % 4), validate=True)
+    except binascii.Error as error:
+        msg = f"invalid base64 value: {value!r}"
+        raise ValueError(msg) from error
+
+
+def _bool_from_json(value: typing.Any, /) -> bool:
+    if not isinstance(value, bool):
+        msg = f"invalid bool value: {value!r}"
+        raise TypeError(msg)
+    return value
+
+
+def _converters(proto_type: ProtoType, py_type: type, /) -> tuple[Converter, Converter]:
+    if proto_type in _INT64_TYPES:
+        return str, int
+    if proto_type in _INT_TYPES:
+        return int, int
+    if proto_type in (ProtoType.Float, ProtoType.Double):
+        return _float_to_json, float
+    if proto_type is ProtoType.Bool:
+        return bool, _bool_from_json
+    if proto_type is ProtoType.String:
+        return str, str
+    if proto_type is ProtoType.Bytes:
+        return (lambda value: base64.b64encode(value).decode()), _bytes_from_json
+
+    if proto_type is ProtoType.Enum:
+        enum_type = typing.cast("type[Enum]", py_type)
+
+        def enum_to_json(value: typing.Any, /) -> str | int:
+            value = enum_type(value)
+            return value.name if value in enum_type else int(value)
+
+        def enum_from_json(value: typing.Any, /) -> typing.Any:
+            if isinstance(value, str):
+                try:
+                    return enum_type[value]
+                except KeyError:
+                    msg = f"invalid {enum_type.__name__} value: {value!r}"
+                    raise ValueError(msg) from None
+            return enum_type(value)
+
+        return enum_to_json, enum_from_json
+
+    return to_dict, (lambda value: from_dict(value, py_type))
+
+
+def _key_converters(proto_type: ProtoType, /) -> tuple[Converter, Converter]:
+    if proto_type is ProtoType.Bool:
+        return (lambda key: "true" if key else "false"), (lambda key: key == "true")
+    if proto_type is ProtoType.String:
+        return str, str
+    return str, int
+
+
+def _json_lookup(py_type: type, /) -> tuple[list[_JsonField], dict[str, _JsonField]]:
+    lookup: tuple[list[_JsonField], dict[str, _JsonField]] | None = (
+        py_type.__dict__.get(_JSON_LOOKUP_NAME)
+    )
+    if lookup is not None:
+        return lookup
+
+    schema: dict[str, ProtoConversionInfo] | None = getattr(
+        py_type, _NAME_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    json_fields: list[_JsonField] = []
+    for field in dataclasses.fields(py_type):
+        info = schema[field.name]
+        if issubclass(info.py_type, _MapBase):
+            map_schema: dict[str, ProtoConversionInfo] = getattr(
+                info.py_type, _NAME_LOOKUP_NAME
+            )
+            key_info, value_info = map_schema["key"], map_schema["value"]
+            to_json, from_json = _converters(value_info.proto_type, value_info.py_type)
+            key_to_json, key_from_json = _key_converters(key_info.proto_type)
+            json_field = _JsonField(
+                info,
+                _json_name(info.name),
+                field.default,
+                to_json,
+                from_json,
+                key_to_json,
+                key_from_json,
+            )
+        else:
+            to_json, from_json = _converters(info.proto_type, info.py_type)
+            json_field = _JsonField(
+                info, _json_name(info.name), field.default, to_json, from_json
+            )
+
+        json_fields.append(json_field)
+
+    # both the json and the original field names are accepted while parsing
+    names = {json_field.info.name: json_field for json_field in json_fields}
+    names.update((json_field.json_name, json_field) for json_field in json_fields)
+    lookup = json_fields, names
+    setattr(py_type, _JSON_LOOKUP_NAME, lookup)
+    return lookup
+
+
+def to_dict(value: typing.Any, /) -> dict[str, typing.Any]:
+    result: dict[str, typing.Any] = {}
+    for json_field in _json_lookup(type(value))[0]:
+        field_value = getattr(value, json_field.info.name)
+        if json_field.info.proto_mode is ProtoMode.Optional and (
+            field_value == json_field.default or field_value is None
+        ):
+            continue
+
+        to_json = json_field.to_json
+        if isinstance(field_value, dict):
+            if field_value:
+                key_to_json = typing.cast(Converter, json_field.key_to_json)
+                result[json_field.json_name] = {
+                    key_to_json(k): to_json(v) for k, v in field_value.items()
+                }
+        elif isinstance(field_value, (list, tuple, LazyList)):
+            if field_value:
+                result[json_field.json_name] = list(map(to_json, field_value))
+        else:
+            result[json_field.json_name] = to_json(field_value)
+
+    return result
+
+
+def from_dict(
+    data: dict[str, typing.Any],
+    py_type: type[T],
+    /,
+    *,
+    ignore_unknown: bool = False,
+) -> T:
+    _, names = _json_lookup(py_type)
+
+    kwargs: dict[str, typing.Any] = {}
+    for key, value in data.items():
+        json_field = names.get(key)
+        if json_field is None:
+            if ignore_unknown:
+                continue
+            msg = f"{py_type.__qualname__}: unknown field: {key!r}"
+            raise ValueError(msg)
+
+        if value is None:
+            continue
+
+        name = json_field.info.name
+        from_json = json_field.from_json
+        if json_field.key_from_json is not None:
+            key_from_json = json_field.key_from_json
+            kwargs[name] = {key_from_json(k): from_json(v) for k, v in value.items()}
+        elif json_field.info.proto_mode.is_multiple():
+            kwargs[name] = list(map(from_json, value))
+        else:
+            kwargs[name] = from_json(value)
+
+    return py_type(**kwargs)
+
+
+def to_json(value: typing.Any, /, **kwargs: typing.Any) -> str:
+    return json.dumps(to_dict(value), **kwargs)
+
+
+def iter_json(value: typing.Any, /, **kwargs: typing.Any) -> typing.Iterator[str]:
+    return json.JSONEncoder(**kwargs).iterencode(to_dict(value))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import array
+import typing
+
+import protobug
+
+T = typing.TypeVar("T")
+
+
+class LazyList(typing.MutableSequence[T]):
+    __slots__ = ("_data", "_ends", "_items", "_py_type", "_starts")
+
+    def __init__(self, iterable: typing.Iterable[T] = (), /):
+        # `None` marks an item that has not been decoded yet
+        self._items: list[T | None] = list(iterable)
+        # spans into `_data`, a start of -1 means there is no raw data
+        self._starts = array.array("q", [-1]) * len(self._items)
+        self._ends = array.array("q", [-1]) * len(self._items)
+        self._data = bytearray()
+        self._py_type: type[T] | None = None
+
+    @classmethod
+    def _from_raw(cls, py_type: type[T], /) -> LazyList[T]:
+        result = cls()
+        result._py_type = py_type
+        return result
+
+    def _append_raw(self, data: bytes, /) -> None:
+        self._starts.append(len(self._data))
+        self._data += data
+        self._ends.append(len(self._data))
+        self._items.append(None)
+
+    def _raw(self, index: int, /) -> memoryview | None:
+        start = self._starts[index]
+        if start < 0 or self._items[index] is not None:
+            return None
+        return memoryview(self._data)[start : self._ends[index]]
+
+    def _load(self, index: int, /) -> T:
+        assert self._py_type is not None
+        start, end = self._starts[index], self._ends[index]
+        return protobug.loads(memoryview(self._data)[start:end], self._py_type)
+
+    def _decode(self, index: int, /) -> T:
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._load(index)
+        return item
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> LazyList[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | LazyList[T]:
+        if isinstance(index, slice):
+            result = type(self)()
+            result._items = self._items[index]
+            result._starts = self._starts[index]
+            result._ends = self._ends[index]
+            result._data = self._data
+            result._py_type = self._py_type
+            return result
+
+        return self._decode(range(len(self._items))[index])
+
+    @typing.overload
+    def __setitem__(self, index: int, value: T) -> None: ...
+
+    @typing.overload
+    def __setitem__(self, index: slice, value: typing.Iterable[T]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: typing.Any) -> None:
+        if isinstance(index, slice):
+            values = list(value)
+            self._items[index] = values
+            self._starts[index] = array.array("q", [-1]) * len(values)
+            self._ends[index] = array.array("q", [-1]) * len(values)
+            return
+
+        index = range(len(self._items))[index]
+        self._items[index] = value
+        self._starts[index] = self._ends[index] = -1
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self._items[index]
+        del self._starts[index]
+        del self._ends[index]
+
+    def insert(self, index: int, value: T) -> None:
+        self._items.insert(index, value)
+        self._starts.insert(index, -1)
+        self._ends.insert(index, -1)
+
+    def __iter__(self) -> typing.Iterator[T]:
+        for index in range(len(self._items)):
+            yield self._decode(index)
+
+    def stream(self) -> typing.Iterator[T]:
+        # decoded items are not kept, so changes to them are not written back
+        for index in range(len(self._items)):
+            item = self._items[index]
+            yield self._load(index) if item is None else item
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyList, list)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self.stream(), other)
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        msg = f"unhashable type: {type(self).__name__!r}"
+        raise TypeError(msg)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.stream())!r})"
@@ -1,26 +1,59 @@
 from __future__ import annotations
 
+import concurrent.futures
+import dataclasses
 import io
+import itertools
+import mmap
+import os
+import pickle
+import sys
+import threading
+import time
 import typing
 
 from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import _SLOT_ARGS
+from protobug._core import ProtoMode
 from protobug._core import ProtoType
 from protobug._core import WireType
+from protobug._core import _decode_varint
 from protobug._core import _double_struct
+from protobug._core import _encode_padded_varint
 from protobug._core import _float_struct
 from protobug._core import _MapBase
+from protobug._core import _RawString
+from protobug._core import _skip_value
 from protobug._core import zigzag_to_signed
+from protobug._instrument import Instrumentation
+from protobug._lazy import LazyList
 
 if typing.TYPE_CHECKING:
+    from protobug._cache import DecodeCache
     from protobug._core import ProtoConversionInfo
 
     T = typing.TypeVar("T")
 
 
+@dataclasses.dataclass(**_SLOT_ARGS)
+class _Frame:
+    # the field of the parent that the nested message is decoded into
+    info: ProtoConversionInfo
+    schema: dict[int, ProtoConversionInfo] | None
+    begin: int
+    length: int | None
+    named_result: dict[str, typing.Any]
+    unknown: bytearray
+    start_ns: int
+    unknown_fields: int
+
+
 class Reader:
-    def __init__(self, reader: io.BufferedIOBase, /):
+    def __init__(self, reader: io.BufferedIOBase, /, *, max_depth: int | None = None):
         self._position = 0
         self._reader = reader
+        self._unknown_fields = 0
+        self._max_depth = max_depth
 
     @typing.overload
     def read(self, py_type: type[T], /, *, length: int | None = None) -> T: ...
@@ -40,25 +73,139 @@ class Reader:
                 msg = f"not a valid protobuf type: {py_type}"
                 raise TypeError(msg)
 
+        instrumentation = Instrumentation._active
+        if instrumentation is None or schema is None:
+            result, named_result, unknown = self._read_fields(schema, length)
+        else:
+            begin = self._position
+            unknown_fields = self._unknown_fields
+            start_ns = time.perf_counter_ns()
+            result, named_result, unknown = self._read_fields(schema, length)
+            _record(
+                instrumentation,
+                typing.cast(type, py_type),
+                schema,
+                named_result,
+                self._position - begin,
+                start_ns,
+                self._unknown_fields - unknown_fields,
+            )
+
+        if py_type is None:
+            return result
+        return _create(py_type, named_result, unknown)
+
+    def _read_fields(
+        self,
+        schema: dict[int, ProtoConversionInfo] | None,
+        length: int | None,
+        /,
+        result: dict[int, list] | None = None,
+        named_result: dict[str, typing.Any] | None = None,
+        unknown: bytearray | None = None,
+    ) -> tuple[dict[int, list], dict[str, typing.Any], bytearray]:
         begin = self._position
-        expected_position = begin + (length or 0)
 
-        result: dict[int, list] = {}
-        named_result: dict[str, typing.Any] = {}
-        while length is None or self._position < expected_position:
+        # allow accumulating the fields of multiple calls
+        if result is None:
+            result = {}
+        if named_result is None:
+            named_result = {}
+        if unknown is None:
+            unknown = bytearray()
+
+        # nested messages are decoded on an explicit stack instead of recursing
+        stack: list[_Frame] = []
+        while True:
+            if length is not None and self._position >= begin + length:
+                if self._position != begin + length:
+                    msg = f"non matching data length: expected {length}, got {self._position - begin}"
+                    raise ValueError(msg)
+                if not stack:
+                    break
+
+                frame = stack.pop()
+                info = frame.info
+                value: typing.Any = _create(info.py_type, named_result, unknown)
+                instrumentation = Instrumentation._active
+                if instrumentation is not None:
+                    _record(
+                        instrumentation,
+                        info.py_type,
+                        schema,
+                        named_result,
+                        self._position - begin,
+                        frame.start_ns,
+                        self._unknown_fields - frame.unknown_fields,
+                    )
+
+                schema = frame.schema
+                begin = frame.begin
+                length = frame.length
+                named_result = frame.named_result
+                unknown = frame.unknown
+                _attach(named_result, info, value)
+                continue
+
             try:
-                key, value = self.read_record(schema)
+                tag_begin = self._position
+                key, wire_type = self.read_tag()
                 conversion_info = schema.get(key) if schema is not None else None
                 if conversion_info is None:
-                    # We could guess here if we have type info from other sources?
-                    if key not in result:
-                        result[key] = []
-                    if isinstance(value, list):
-                        result[key].extend(value)
-                    else:
-                        result[key].append(value)
+                    self._unknown_fields += 1
+                    if schema is None:
+                        # We could guess here if we have type info from other sources?
+                        result.setdefault(key, []).append(self.read_value(wire_type))
+                        continue
+
+                    # Keep the raw record so it can be written back verbatim
+                    unknown += _encode_padded_varint(
+                        key << 3 | wire_type, self._position - tag_begin
+                    )
+                    self._copy_value(wire_type, unknown)
+
+                elif conversion_info.lazy and wire_type is WireType.LEN:
+                    # Only keep the payload, it gets decoded on access
+                    value = typing.cast("bytes", self.read_value(wire_type))
+                    if conversion_info.proto_type is ProtoType.String:
+                        named_result[conversion_info.name] = _RawString(value)
+                        continue
+
+                    target = named_result.get(conversion_info.name)
+                    if target is None:
+                        target = LazyList._from_raw(conversion_info.py_type)
+                        named_result[conversion_info.name] = target
+                    target._append_raw(value)
+
+                elif (
+                    conversion_info.proto_type is ProtoType.Embed
+                    and wire_type is WireType.LEN
+                ):
+                    if self._max_depth is not None and len(stack) >= self._max_depth:
+                        msg = f"maximum nesting depth exceeded: {self._max_depth}"
+                        raise ValueError(msg)
+
+                    size = self.read_varint()
+                    stack.append(
+                        _Frame(
+                            conversion_info,
+                            schema,
+                            begin,
+                            length,
+                            named_result,
+                            unknown,
+                            time.perf_counter_ns() if Instrumentation._active else 0,
+                            self._unknown_fields,
+                        )
+                    )
+                    schema = getattr(conversion_info.py_type, _PID_LOOKUP_NAME)
+                    begin = self._position
+                    length = size
+                    named_result = {}
+                    unknown = bytearray()
 
                 else:
+                    value = self._read_record_value(conversion_info, wire_type)
                     name = conversion_info.name
                     if isinstance(value, list):
                         if not value:
@@ -80,17 +227,12 @@ class Reader:
                         named_result[name] = value
 
             except EOFError:
+                if length is not None:
+                    msg = f"non matching data length: expected {length}, got {self._position - begin}"
+                    raise ValueError(msg) from None
                 break
 
-        if length is not None and self._position != expected_position:
-            msg = f"non matching data length: expected {length}, got {self._position - begin}"
-            raise ValueError(msg)
-
-        if py_type is None:
-            return result
-        result_type = py_type(**named_result)
-        result_type._unknown = result
-        return result_type
+        return result, named_result, unknown
 
     def read_record(
         self, schema: dict[int, ProtoConversionInfo] | None = None, /
@@ -101,6 +243,11 @@ class Reader:
             # We have no info on this key, read the raw value
             return key, self.read_value(wire_type)
 
+        return key, self._read_record_value(info, wire_type)
+
+    def _read_record_value(
+        self, info: ProtoConversionInfo, wire_type: WireType, /
+    ) -> typing.Any:
         expected_wire_type = info.proto_type.wire_type()
         if not info.proto_mode.is_multiple():
             # Single item, read and decode type
@@ -110,11 +257,11 @@ class Reader:
                     f"expected {expected_wire_type}, got {wire_type}"
                 )
                 raise ValueError(msg)
-            return key, self.read_type(info.proto_type, info.py_type)
+            return self.read_type(info.proto_type, info.py_type)
 
         if wire_type is expected_wire_type:
             # single, repeated, non-packed value, wrap in list
-            return key, [self.read_type(info.proto_type, info.py_type)]
+            return [self.read_type(info.proto_type, info.py_type)]
 
         if wire_type is not WireType.LEN:
             expected_type_msg = (
@@ -138,7 +285,7 @@ class Reader:
             msg = f"non-matching packed length: expected {length}, got {self._position - begin}"
             raise ValueError(msg)
 
-        return key, results
+        return results
 
     def read_type(
         self, proto_type: ProtoType, py_type: type | None = None, /
@@ -148,52 +295,7 @@ class Reader:
             length = typing.cast(int, self.read_value(WireType.VARINT))
             return self.read(py_type, length=length)
 
-        value = self.read_value(proto_type.wire_type())
-        if proto_type is ProtoType.Enum:
-            return value if py_type is None else py_type(value)
-
-        if proto_type in (
-            ProtoType.Bytes,
-            ProtoType.Int32,
-            ProtoType.Int64,
-            ProtoType.UInt32,
-            ProtoType.UInt64,
-        ):
-            return value
-
-        if proto_type is ProtoType.Bool:
-            assert isinstance(value, int)
-            return bool(value)
-
-        if proto_type is ProtoType.String:
-            assert isinstance(value, bytes)
-            return value.decode()
-
-        if proto_type is ProtoType.Float:
-            assert isinstance(value, bytes)
-            return _float_struct.unpack(value)[0]
-
-        if proto_type is ProtoType.Double:
-            assert isinstance(value, bytes)
-            return _double_struct.unpack(value)[0]
-
-        if proto_type in (
-            ProtoType.SInt32,
-            ProtoType.SInt64,
-            ProtoType.SFixed32,
-            ProtoType.SFixed64,
-        ):
-            if proto_type in (ProtoType.SFixed32, ProtoType.SFixed64):
-                assert isinstance(value, bytes)
-                value = int.from_bytes(value, "little")
-            assert isinstance(value, int)
-            return zigzag_to_signed(value)
-
-        if proto_type in (ProtoType.Fixed32, ProtoType.Fixed64):
-            assert isinstance(value, bytes)
-            return int.from_bytes(value, "little", signed=True)
-
-        raise ValueError(f"invalid protobuf value: {value!r}")
+        return _convert(self.read_value(proto_type.wire_type()), proto_type, py_type)
 
     def read_value(self, wire_type: WireType, /) -> int | bytes:
         if wire_type in (WireType.SGROUP, WireType.EGROUP):
@@ -219,6 +321,23 @@ class Reader:
             raise ValueError(msg)
         return data
 
+    def _copy_value(self, wire_type: WireType, target: bytearray, /) -> None:
+        if wire_type not in (WireType.VARINT, WireType.LEN):
+            target += typing.cast("bytes", self.read_value(wire_type))
+            return
+
+        begin = self._position
+        value = self.read_varint()
+        # a varint is fully determined by its value and encoded width
+        target += _encode_padded_varint(value, self._position - begin)
+        if wire_type is WireType.LEN:
+            data = self._reader.read(value)
+            self._position += len(data)
+            if len(data) < value:
+                msg = f"not enough data: expected {value}, got {len(data)}"
+                raise ValueError(msg)
+            target += data
+
     def read_tag(self, /) -> tuple[int, WireType]:
         value = self.read_varint()
         return value >> 3, WireType(value & 0b111)
@@ -246,26 +365,342 @@ class Reader:
         return result
 
 
+def _record(
+    instrumentation: Instrumentation,
+    py_type: type,
+    schema: dict[int, ProtoConversionInfo] | None,
+    named_result: dict[str, typing.Any],
+    size: int,
+    start_ns: int,
+    unknown_fields: int,
+    /,
+) -> None:
+    instrumentation.record(
+        "decode",
+        py_type,
+        size,
+        start_ns,
+        time.perf_counter_ns(),
+        fields=len(named_result),
+        unknown_fields=unknown_fields,
+        packed_elements=sum(
+            len(named_result.get(info.name, ()))
+            for info in (schema or {}).values()
+            if info.proto_mode is ProtoMode.Packed
+        ),
+    )
+
+
+def _attach(
+    named_result: dict[str, typing.Any], info: ProtoConversionInfo, value: typing.Any, /
+) -> None:
+    if not info.proto_mode.is_multiple():
+        named_result[info.name] = value
+    elif isinstance(value, _MapBase):
+        named_result.setdefault(info.name, {})[value.key] = value.value
+    else:
+        named_result.setdefault(info.name, []).append(value)
+
+
+def _create(
+    py_type: type[T], named_result: dict[str, typing.Any], unknown: bytearray, /
+) -> T:
+    result_type = py_type(**named_result)
+    # bypass frozen and tracking `__setattr__`
+    object.__setattr__(result_type, "_unknown", bytes(unknown))
+    return result_type
+
+
+def _convert(
+    value: int | bytes, proto_type: ProtoType, py_type: type | None = None, /
+) -> typing.Any:
+    if proto_type in (ProtoType.Int32, ProtoType.Int64, ProtoType.Enum):
+        assert isinstance(value, int)
+        # negative values may be sign extended to 32 or 64 bits
+        bits = 64 if proto_type is ProtoType.Int64 else 32
+        value &= (1 << bits) - 1
+        if value >> bits - 1:
+            value -= 1 << bits
+        if proto_type is ProtoType.Enum and py_type is not None:
+            return py_type(value)
+        return value
+
+    if proto_type in (ProtoType.Bytes, ProtoType.UInt32, ProtoType.UInt64):
+        return value
+
+    if proto_type is ProtoType.Bool:
+        assert isinstance(value, int)
+        return bool(value)
+
+    if proto_type is ProtoType.String:
+        assert isinstance(value, bytes)
+        return value.decode()
+
+    if proto_type is ProtoType.Float:
+        assert isinstance(value, bytes)
+        return _float_struct.unpack(value)[0]
+
+    if proto_type is ProtoType.Double:
+        assert isinstance(value, bytes)
+        return _double_struct.unpack(value)[0]
+
+    if proto_type in (ProtoType.SInt32, ProtoType.SInt64):
+        assert isinstance(value, int)
+        return zigzag_to_signed(value)
+
+    if proto_type in (
+        ProtoType.Fixed32,
+        ProtoType.Fixed64,
+        ProtoType.SFixed32,
+        ProtoType.SFixed64,
+    ):
+        assert isinstance(value, bytes)
+        signed = proto_type in (ProtoType.SFixed32, ProtoType.SFixed64)
+        return int.from_bytes(value, "little", signed=signed)
+
+    raise ValueError(f"invalid protobuf value: {value!r}")
+
+
 @typing.overload
-def load(file: io.BufferedIOBase, py_type: type[T], /) -> T: ...
+def load(
+    file: io.BufferedIOBase, py_type: type[T], /, *, max_depth: int | None = ...
+) -> T: ...
 
 
 @typing.overload
-def load(file: io.BufferedIOBase, py_type: None = None, /) -> dict: ...
+def load(
+    file: io.BufferedIOBase, py_type: None = None, /, *, max_depth: int | None = ...
+) -> dict: ...
 
 
-def load(file: io.BufferedIOBase, py_type=None, /):  # type: ignore
-    return Reader(file).read(py_type)
+def load(file: io.BufferedIOBase, py_type=None, /, *, max_depth=None):  # type: ignore
+    return Reader(file, max_depth=max_depth).read(py_type)
 
 
 @typing.overload
-def loads(data: bytes | bytearray | memoryview, py_type: type[T], /) -> T: ...
+def loads(
+    data: bytes | bytearray | memoryview,
+    py_type: type[T],
+    /,
+    *,
+    max_depth: int | None = ...,
+    parallel: int | None = ...,
+    executor: concurrent.futures.Executor | None = ...,
+    cache: DecodeCache | None = ...,
+) -> T: ...
 
 
 @typing.overload
-def loads(data: bytes | bytearray | memoryview, py_type: None = None, /) -> dict: ...
+def loads(
+    data: bytes | bytearray | memoryview,
+    py_type: None = None,
+    /,
+    *,
+    max_depth: int | None = ...,
+) -> dict: ...
+
+
+def loads(  # type: ignore
+    data: bytes | bytearray | memoryview,
+    py_type=None,
+    /,
+    *,
+    max_depth=None,
+    parallel=None,
+    executor=None,
+    cache=None,
+):
+    if cache is not None:
+        return cache._load(
+            data,
+            py_type,
+            lambda: loads(
+                data,
+                py_type,
+                max_depth=max_depth,
+                parallel=parallel,
+                executor=executor,
+            ),
+        )
+
+    if executor is not None and parallel is None:
+        parallel = os.cpu_count() or 1
+    if (
+        parallel is not None
+        and (parallel > 1 or executor is not None)
+        and py_type is not None
+        and max_depth != 0
+    ):
+        return _loads_parallel(memoryview(data), py_type, max_depth, parallel, executor)
 
-
-def loads(data: bytes | bytearray | memoryview, py_type=None, /):  # type: ignore
     with io.BytesIO(data) as buffer:
-        return Reader(buffer).read(py_type)
+        return Reader(buffer, max_depth=max_depth).read(py_type)
+
+
+# repeated message fields with fewer items are decoded sequentially
+_MIN_PARALLEL_ITEMS = 256
+
+
+# pools are kept around, starting workers costs more than most decodes
+_EXECUTORS: dict[int, concurrent.futures.Executor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _shared_executor(workers: int, /) -> concurrent.futures.Executor:
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(workers)
+        if executor is None:
+            # free threaded builds can share the data, others need worker processes
+            if sys.version_info >= (3, 13) and not sys._is_gil_enabled():
+                executor = concurrent.futures.ThreadPoolExecutor(workers)
+            else:
+                executor = concurrent.futures.ProcessPoolExecutor(workers)
+            _EXECUTORS[workers] = executor
+    return executor
+
+
+def _loads_parallel(
+    data: memoryview,
+    py_type: type[T],
+    max_depth: int | None,
+    parallel: int,
+    executor: concurrent.futures.Executor | None,
+    /,
+) -> T:
+    schema: dict[int, ProtoConversionInfo] | None = getattr(
+        py_type, _PID_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    # split the repeated message fields from all other records
+    spans: dict[int, list[tuple[int, int, int]]] = {}
+    other: list[tuple[int, int]] = []
+    position = 0
+    while position < len(data):
+        begin = position
+        tag, position = _decode_varint(data, position)
+        pid, wire_type = tag >> 3, WireType(tag & 0b111)
+        start, position = _skip_value(data, position, wire_type)
+        info = schema.get(pid)
+        if (
+            info is not None
+            and wire_type is WireType.LEN
+            and info.proto_type is ProtoType.Embed
+            and info.proto_mode is ProtoMode.Repeated
+            and not info.lazy
+            and not issubclass(info.py_type, _MapBase)
+        ):
+            spans.setdefault(pid, []).append((begin, start, position))
+        else:
+            other.append((begin, position))
+
+    for pid, items in list(spans.items()):
+        if len(items) < _MIN_PARALLEL_ITEMS:
+            other.extend((begin, end) for begin, _, end in spans.pop(pid))
+
+    rest = bytearray()
+    for begin, end in other:
+        rest += data[begin:end]
+    with io.BytesIO(rest) as buffer:
+        _, named_result, unknown = Reader(buffer, max_depth=max_depth)._read_fields(
+            schema, None
+        )
+
+    if not spans:
+        return _create(py_type, named_result, unknown)
+
+    if executor is None:
+        executor = _shared_executor(parallel)
+    # threads share the data and the results, processes get copies
+    shared = isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+
+    for pid, items in spans.items():
+        # hand out a few contiguous batches per worker
+        chunks: list[bytes | memoryview] = []
+        offsets: list[list[tuple[int, int]]] = []
+        batch_size = -(-len(items) // (parallel * 4))
+        for index in range(0, len(items), batch_size):
+            batch = items[index : index + batch_size]
+            base = batch[0][1]
+            chunk = data[base : batch[-1][2]]
+            chunks.append(chunk if shared else bytes(chunk))
+            offsets.append([(start - base, end - base) for _, start, end in batch])
+
+        info = schema[pid]
+        values = named_result.setdefault(info.name, [])
+        for result in executor.map(
+            _load_batch,
+            chunks,
+            offsets,
+            itertools.repeat(info.py_type),
+            itertools.repeat(None if max_depth is None else max_depth - 1),
+            itertools.repeat(not shared),
+        ):
+            values.extend(pickle.loads(result) if isinstance(result, bytes) else result)
+
+    return _create(py_type, named_result, unknown)
+
+
+def _load_batch(
+    data: bytes | memoryview,
+    spans: list[tuple[int, int]],
+    py_type: type[T],
+    max_depth: int | None,
+    pickled: bool,
+    /,
+) -> list[T] | bytes:
+    results = [
+        loads(data[start:end], py_type, max_depth=max_depth) for start, end in spans
+    ]
+    if not pickled:
+        return results
+
+    with io.BytesIO() as buffer:
+        _StatePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(results)
+        return buffer.getvalue()
+
+
+class _StatePickler(pickle.Pickler):
+    # messages usually pickle as their encoding, which the parent would decode again
+    def reducer_override(self, obj: typing.Any) -> typing.Any:
+        py_type = type(obj)
+        schema: dict[int, ProtoConversionInfo] | None = getattr(
+            py_type, _PID_LOOKUP_NAME, None
+        )
+        if not schema:
+            return NotImplemented
+
+        state = vars(obj)
+        named_result = {info.name: state[info.name] for info in schema.values()}
+        return _create, (py_type, named_result, state.get("_unknown", b""))
+
+
+@typing.overload
+def load_path(
+    path: str | os.PathLike[str], py_type: type[T], /, *, max_depth: int | None = ...
+) -> T: ...
+
+
+@typing.overload
+def load_path(
+    path: str | os.PathLike[str],
+    py_type: None = None,
+    /,
+    *,
+    max_depth: int | None = ...,
+) -> dict: ...
+
+
+def load_path(path: str | os.PathLike[str], py_type=None, /, *, max_depth=None):  # type: ignore
+    with open(path, "rb") as file:
+        # mmap cannot map empty files
+        if not os.fstat(file.fileno()).st_size:
+            return Reader(file, max_depth=max_depth).read(py_type)
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            reader = Reader(
+                typing.cast("io.BufferedIOBase", mapped), max_depth=max_depth
+            )
+            return reader.read(py_type)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import bz2
+import concurrent.futures
+import lzma
+import mmap
+import os
+import typing
+import zlib
+
+from protobug._core import String
+from protobug._core import UInt32
+from protobug._core import UInt64
+from protobug._core import _decode_varint
+from protobug._core import _encode_varint
+from protobug._core import field
+from protobug._core import message
+from protobug._reader import loads
+from protobug._writer import dumps
+
+if typing.TYPE_CHECKING:
+    import types
+
+    from typing_extensions import Self
+
+T = typing.TypeVar("T")
+
+_MAGIC = b"PBR1"
+_TRAILER_SIZE = 8 + len(_MAGIC)
+
+_CODECS: dict[
+    str,
+    tuple[
+        typing.Callable[[bytes], bytes],
+        typing.Callable[[typing.Union[bytes, memoryview]], bytes],
+    ],
+] = {
+    "none": (bytes, bytes),
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+
+def register_codec(
+    name: str,
+    compress: typing.Callable[[bytes], bytes],
+    decompress: typing.Callable[[typing.Union[bytes, memoryview]], bytes],
+    /,
+) -> None:
+    _CODECS[name] = compress, decompress
+
+
+@message
+class _Footer:
+    codec: String = field(1)
+    records_per_block: UInt32 = field(2)
+    count: UInt64 = field(3)
+    # start of every block, followed by the start of the footer
+    offsets: list[UInt64] = field(4, default_factory=list)
+
+
+class RecordWriter:
+    def __init__(
+        self,
+        file: typing.BinaryIO,
+        /,
+        *,
+        codec: str = "zlib",
+        records_per_block: int = 1024,
+    ):
+        if codec not in _CODECS:
+            msg = f"unknown codec: {codec}"
+            raise ValueError(msg)
+        if records_per_block < 1:
+            msg = f"records per block must be positive, got {records_per_block}"
+            raise ValueError(msg)
+
+        self._file = file
+        self._compress = _CODECS[codec][0]
+        self._footer = _Footer(codec, records_per_block, 0)
+        self._block = bytearray()
+        self._block_count = 0
+        self._closed = False
+        self._position = self._file.write(_MAGIC)
+
+    def write(self, value: typing.Any, /) -> None:
+        if self._closed:
+            msg = "write to closed record file"
+            raise ValueError(msg)
+
+        data = dumps(value)
+        self._block += _encode_varint(len(data))
+        self._block += data
+        self._block += zlib.crc32(data).to_bytes(4, "little")
+        self._block_count += 1
+        self._footer.count += 1
+        if self._block_count == self._footer.records_per_block:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._block_count:
+            return
+        self._footer.offsets.append(self._position)
+        self._position += self._file.write(self._compress(bytes(self._block)))
+        self._block.clear()
+        self._block_count = 0
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._flush()
+        self._footer.offsets.append(self._position)
+        footer = dumps(self._footer)
+        self._file.write(footer)
+        self._file.write(len(footer).to_bytes(8, "little"))
+        self._file.write(_MAGIC)
+        self._closed = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class RecordReader(typing.Generic[T]):
+    def __init__(
+        self,
+        source: str | os.PathLike[str] | bytes | bytearray | memoryview,
+        py_type: type[T],
+        /,
+    ):
+        self._mmap: mmap.mmap | None = None
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                if os.fstat(file.fileno()).st_size:
+                    self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            data = memoryview(self._mmap if self._mmap is not None else b"")
+        else:
+            data = memoryview(source)
+        self._data = data
+        self._cached: tuple[int, list[memoryview]] | None = None
+
+        if (
+            len(data) < len(_MAGIC) + _TRAILER_SIZE
+            or data[: len(_MAGIC)] != _MAGIC
+            or data[-len(_MAGIC) :] != _MAGIC
+        ):
+            self.close()
+            msg = "not a protobug record file"
+            raise ValueError(msg)
+
+        footer_size = int.from_bytes(data[-_TRAILER_SIZE : -len(_MAGIC)], "little")
+        footer_end = len(data) - _TRAILER_SIZE
+        footer = loads(data[footer_end - footer_size : footer_end], _Footer)
+        if footer.codec not in _CODECS:
+            self.close()
+            msg = f"unknown codec: {footer.codec}"
+            raise ValueError(msg)
+
+        self._py_type = py_type
+        self._footer = footer
+        self._decompress = _CODECS[footer.codec][1]
+
+    def __len__(self) -> int:
+        return self._footer.count
+
+    @property
+    def block_count(self) -> int:
+        return len(self._footer.offsets) - 1
+
+    def __getitem__(self, index: int) -> T:
+        index = range(self._footer.count)[index]
+        block, position = divmod(index, self._footer.records_per_block)
+        # keep the last block around for sequential access
+        if self._cached is None or self._cached[0] != block:
+            self._cached = block, self._read_block(block)
+        return loads(self._cached[1][position], self._py_type)
+
+    def __iter__(self) -> typing.Iterator[T]:
+        return self.iter_records()
+
+    def iter_records(self, /, *, workers: int | None = None) -> typing.Iterator[T]:
+        if workers is None:
+            for block in range(self.block_count):
+                yield from self._load_block(block)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            for records in executor.map(self._load_block, range(self.block_count)):
+                yield from records
+
+    def _load_block(self, block: int, /) -> list[T]:
+        return [loads(record, self._py_type) for record in self._read_block(block)]
+
+    def _read_block(self, block: int, /) -> list[memoryview]:
+        offsets = self._footer.offsets
+        data = memoryview(
+            self._decompress(self._data[offsets[block] : offsets[block + 1]])
+        )
+
+        records: list[memoryview] = []
+        position = 0
+        first = block * self._footer.records_per_block
+        while position < len(data):
+            length, position = _decode_varint(data, position)
+            end = position + length
+            if end + 4 > len(data):
+                msg = f"record {first + len(records)}: not enough data"
+                raise ValueError(msg)
+            record = data[position:end]
+            if zlib.crc32(record) != int.from_bytes(data[end : end + 4], "little"):
+                msg = f"record {first + len(records)}: checksum mismatch"
+                raise ValueError(msg)
+            records.append(record)
+            position = end + 4
+
+        return records
+
+    def close(self) -> None:
+        self._cached = None
+        if self._mmap is not None:
+            self._data.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import typing
+
+from protobug._core import _PID_LOOKUP_NAME
+from protobug._core import ProtoType
+from protobug._core import WireType
+from protobug._core import _decode_varint
+from protobug._core import _encode_varint
+from protobug._core import _skip_value
+from protobug._writer import Writer
+from protobug._writer import _BufferWriter
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoConversionInfo
+
+Path = typing.Union[int, tuple[int, ...]]
+
+
+def rewrite(
+    data: bytes | bytearray | memoryview,
+    py_type: type,
+    /,
+    *,
+    drop: typing.Iterable[Path] = (),
+    replace: typing.Mapping[Path, typing.Any] | None = None,
+) -> bytes:
+    drops = {_to_path(path) for path in drop}
+    replacements = {_to_path(path): value for path, value in (replace or {}).items()}
+    for path in drops.intersection(replacements):
+        msg = f"cannot both drop and replace {path}"
+        raise ValueError(msg)
+
+    return bytes(_rewrite(memoryview(data), py_type, drops, replacements))
+
+
+def _to_path(path: Path, /) -> tuple[int, ...]:
+    path = (path,) if isinstance(path, int) else tuple(path)
+    if not path:
+        msg = "empty field path"
+        raise ValueError(msg)
+    return path
+
+
+def _rewrite(
+    data: memoryview,
+    py_type: type,
+    drops: set[tuple[int, ...]],
+    replacements: dict[tuple[int, ...], typing.Any],
+    /,
+) -> bytearray:
+    schema: dict[int, ProtoConversionInfo] | None = getattr(
+        py_type, _PID_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    # split the paths into the ones for this level and the nested ones
+    dropped = {path[0] for path in drops if len(path) == 1}
+    replaced = {
+        path[0]: value for path, value in replacements.items() if len(path) == 1
+    }
+    nested: dict[
+        int, tuple[set[tuple[int, ...]], dict[tuple[int, ...], typing.Any]]
+    ] = {}
+    for path in drops:
+        if len(path) > 1:
+            nested.setdefault(path[0], (set(), {}))[0].add(path[1:])
+    for path, value in replacements.items():
+        if len(path) > 1:
+            nested.setdefault(path[0], (set(), {}))[1][path[1:]] = value
+
+    for pid in (*dropped, *replaced, *nested):
+        if pid not in schema:
+            msg = f"{py_type.__qualname__}: unknown field id: {pid}"
+            raise ValueError(msg)
+    for pid in nested:
+        if schema[pid].proto_type is not ProtoType.Embed:
+            msg = f"{py_type.__qualname__}.{schema[pid].name}: not a message field"
+            raise ValueError(msg)
+
+    result = bytearray()
+    pending = dict(replaced)
+    missing = set(nested)
+    position = 0
+    while position < len(data):
+        begin = position
+        tag, position = _decode_varint(data, position)
+        pid, wire_type = tag >> 3, WireType(tag & 0b111)
+        start, position = _skip_value(data, position, wire_type)
+
+        if pid in dropped:
+            continue
+
+        if pid in replaced:
+            # emit the replacement in place of the first occurrence
+            if pid in pending:
+                result += _encode_field(schema[pid], pending.pop(pid))
+            continue
+
+        if pid in nested and wire_type is WireType.LEN:
+            missing.discard(pid)
+            sub_drops, sub_replacements = nested[pid]
+            payload = _rewrite(
+                data[start:position], schema[pid].py_type, sub_drops, sub_replacements
+            )
+            result += _encode_varint(tag)
+            result += _encode_varint(len(payload))
+            result += payload
+            continue
+
+        # untouched records are copied verbatim
+        result += data[begin:position]
+
+    for pid, value in pending.items():
+        result += _encode_field(schema[pid], value)
+
+    # nested replacements create their parent message if it is missing
+    for pid in sorted(missing):
+        sub_replacements = nested[pid][1]
+        if not sub_replacements:
+            continue
+        info = schema[pid]
+        if info.proto_mode.is_multiple():
+            msg = f"{py_type.__qualname__}.{info.name}: cannot replace fields of a missing repeated message"
+            raise ValueError(msg)
+        payload = _rewrite(memoryview(b""), info.py_type, set(), sub_replacements)
+        result += _encode_varint(pid << 3 | WireType.LEN)
+        result += _encode_varint(len(payload))
+        result += payload
+
+    return result
+
+
+def _encode_field(
+    conversion_info: ProtoConversionInfo, value: typing.Any, /
+) -> bytearray:
+    buffer = bytearray()
+    writer = Writer(typing.cast("io.BufferedIOBase", _BufferWriter(buffer)))
+    writer._write_field(conversion_info, dataclasses.MISSING, value)
+    return buffer
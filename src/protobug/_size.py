@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+from protobug._core import _CACHE_ENCODING_NAME
+from protobug._core import _NAME_LOOKUP_NAME
+from protobug._core import ProtoMode
+from protobug._core import ProtoType
+from protobug._core import WireType
+from protobug._core import _MapBase
+from protobug._core import _RawString
+from protobug._core import _varint_size
+from protobug._core import signed_to_zigzag
+from protobug._lazy import LazyList
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoConversionInfo
+
+_FIXED_SIZES = {
+    ProtoType.Bool: 1,
+    ProtoType.Fixed32: 4,
+    ProtoType.SFixed32: 4,
+    ProtoType.Float: 4,
+    ProtoType.Fixed64: 8,
+    ProtoType.SFixed64: 8,
+    ProtoType.Double: 8,
+}
+
+
+def byte_size(
+    value: typing.Any, /, *, sizes: dict[int, tuple[typing.Any, int]] | None = None
+) -> int:
+    # entries keep their message alive so the id cannot be reused,
+    # messages must not be changed while their sizes are kept around
+    if sizes is not None:
+        entry = sizes.get(id(value))
+        if entry is not None and entry[0] is value:
+            return entry[1]
+
+    py_type = type(value)
+    schema: dict[str, ProtoConversionInfo] | None = getattr(
+        py_type, _NAME_LOOKUP_NAME, None
+    )
+    if not schema:
+        msg = f"not a valid protobuf type: {py_type}"
+        raise TypeError(msg)
+
+    if getattr(py_type, _CACHE_ENCODING_NAME, False):
+        encoded = vars(value).get("_encoded")
+        if encoded is not None:
+            return len(encoded)
+
+    size = 0
+    for field in dataclasses.fields(value):
+        conversion_info = schema[field.name]
+        if conversion_info.lazy:
+            field_value = vars(value)[conversion_info.name]
+        else:
+            field_value = getattr(value, conversion_info.name)
+        size += _field_size(conversion_info, field.default, field_value, sizes)
+
+    unknown = getattr(value, "_unknown", None)
+    if unknown:
+        size += len(unknown)
+
+    # map entries are created on the fly, their ids are not stable
+    if sizes is not None and not isinstance(value, _MapBase):
+        sizes[id(value)] = value, size
+    return size
+
+
+def _field_size(
+    conversion_info: ProtoConversionInfo,
+    default: typing.Any,
+    field_value: typing.Any,
+    sizes: dict[int, tuple[typing.Any, int]] | None,
+    /,
+) -> int:
+    if conversion_info.proto_mode is ProtoMode.Optional and (
+        field_value == default or field_value is None
+    ):
+        return 0
+
+    proto_type = conversion_info.proto_type
+    if isinstance(field_value, LazyList):
+        tag_size = _tag_size(conversion_info.pid, WireType.LEN)
+        size = 0
+        for index in range(len(field_value)):
+            raw = field_value._raw(index)
+            if raw is None:
+                size += tag_size + _value_size(field_value[index], proto_type, sizes)
+            else:
+                size += tag_size + _varint_size(len(raw)) + len(raw)
+        return size
+
+    if isinstance(field_value, (list, tuple)):
+        if conversion_info.proto_mode is ProtoMode.Packed and len(field_value) > 2:
+            length = sum(_value_size(item, proto_type, sizes) for item in field_value)
+            return (
+                _tag_size(conversion_info.pid, WireType.LEN)
+                + _varint_size(length)
+                + length
+            )
+
+        tag_size = _tag_size(conversion_info.pid, proto_type.wire_type())
+        return sum(
+            tag_size + _value_size(item, proto_type, sizes) for item in field_value
+        )
+
+    if isinstance(field_value, dict):
+        tag_size = _tag_size(conversion_info.pid, WireType.LEN)
+        map_schema = getattr(conversion_info.py_type, _NAME_LOOKUP_NAME)
+        key_info, value_info = map_schema["key"], map_schema["value"]
+        size = 0
+        for k, v in field_value.items():
+            length = _field_size(key_info, None, k, sizes) + _field_size(
+                value_info, None, v, sizes
+            )
+            size += tag_size + _varint_size(length) + length
+        return size
+
+    return _tag_size(conversion_info.pid, proto_type.wire_type()) + _value_size(
+        field_value, proto_type, sizes
+    )
+
+
+def _tag_size(pid: int, wire_type: WireType, /) -> int:
+    return _varint_size((pid << 3) | wire_type)
+
+
+def _value_size(
+    value: typing.Any,
+    proto_type: ProtoType,
+    sizes: dict[int, tuple[typing.Any, int]] | None,
+    /,
+) -> int:
+    size = _FIXED_SIZES.get(proto_type)
+    if size is not None:
+        return size
+
+    if proto_type in (ProtoType.Int32, ProtoType.Enum, ProtoType.Int64):
+        if value < 0:
+            value += 1
+            value += (
+                0xFFFFFFFF_FFFFFFFF if proto_type is ProtoType.Int64 else 0xFFFFFFFF
+            )
+        return _varint_size(value)
+
+    if proto_type in (ProtoType.SInt32, ProtoType.SInt64):
+        return _varint_size(signed_to_zigzag(value))
+
+    if proto_type in (ProtoType.UInt32, ProtoType.UInt64):
+        return _varint_size(value)
+
+    if type(value) is _RawString:
+        length = len(value)
+    elif proto_type is ProtoType.String:
+        length = len(value) if value.isascii() else len(value.encode())
+    elif proto_type is ProtoType.Embed:
+        length = byte_size(value, sizes=sizes)
+    else:
+        length = len(value)
+
+    return _varint_size(length) + length
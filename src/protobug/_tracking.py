@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import functools
+import typing
+import weakref
+
+# instance state that does not affect the encoding
+_UNTRACKED_NAMES = ("_encoded", "_parents")
+
+
+def _setattr(self: typing.Any, name: str, value: typing.Any, /) -> None:
+    if name not in _UNTRACKED_NAMES:
+        if type(value) is list:
+            value = _TrackedList(value, self)
+        elif type(value) is dict:
+            value = _TrackedDict(value, self)
+        _invalidate(self)
+    object.__setattr__(self, name, value)
+
+
+def _invalidate(value: typing.Any, /) -> None:
+    stack = [value]
+    while stack:
+        state = vars(stack.pop())
+        # parents of a message without cached encoding were already invalidated
+        if state.get("_encoded") is None:
+            continue
+        state["_encoded"] = None
+        for ref in state.get("_parents", ()):
+            parent = ref()
+            if parent is not None:
+                stack.append(parent)
+
+
+def _adopt(parent: typing.Any, child: typing.Any, /) -> None:
+    parents: list[weakref.ref] = vars(child).setdefault("_parents", [])
+    if not any(ref() is parent for ref in parents):
+        parents.append(weakref.ref(parent))
+
+
+def _tracked(method: typing.Any, /) -> typing.Any:
+    @functools.wraps(method)
+    def wrapper(
+        self: typing.Any, /, *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.Any:
+        result = method(self, *args, **kwargs)
+        owner = None if self._owner is None else self._owner()
+        if owner is not None:
+            _invalidate(owner)
+        return result
+
+    return wrapper
+
+
+class _TrackedList(list):
+    __slots__ = ("_owner",)
+
+    def __init__(
+        self, iterable: typing.Iterable[typing.Any] = (), owner: typing.Any = None, /
+    ):
+        super().__init__(iterable)
+        self._owner = None if owner is None else weakref.ref(owner)
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return list, (list(self),)
+
+    __setitem__ = _tracked(list.__setitem__)
+    __delitem__ = _tracked(list.__delitem__)
+    __iadd__ = _tracked(list.__iadd__)
+    __imul__ = _tracked(list.__imul__)
+    append = _tracked(list.append)
+    extend = _tracked(list.extend)
+    insert = _tracked(list.insert)
+    pop = _tracked(list.pop)
+    remove = _tracked(list.remove)
+    clear = _tracked(list.clear)
+    sort = _tracked(list.sort)
+    reverse = _tracked(list.reverse)
+
+
+class _TrackedDict(dict):
+    __slots__ = ("_owner",)
+
+    def __init__(self, mapping: typing.Any = (), owner: typing.Any = None, /):
+        super().__init__(mapping)
+        self._owner = None if owner is None else weakref.ref(owner)
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return dict, (dict(self),)
+
+    __setitem__ = _tracked(dict.__setitem__)
+    __delitem__ = _tracked(dict.__delitem__)
+    __ior__ = _tracked(dict.__ior__)
+    pop = _tracked(dict.pop)
+    popitem = _tracked(dict.popitem)
+    setdefault = _tracked(dict.setdefault)
+    update = _tracked(dict.update)
+    clear = _tracked(dict.clear)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import typing
+
+from protobug._core import WireType
+from protobug._core import _decode_varint
+from protobug._core import _skip_value
+from protobug._reader import _convert
+
+if typing.TYPE_CHECKING:
+    from protobug._core import ProtoType
+
+RawTree = dict[int, list[typing.Union[int, bytes, "RawField"]]]
+
+_FIXED_SIZES = {WireType.I32: 4, WireType.I64: 8}
+
+
+class RawField:
+    __slots__ = ("_cache", "data")
+
+    def __init__(self, data: bytes | bytearray | memoryview, /):
+        self.data = memoryview(data)
+        self._cache: dict[typing.Any, typing.Any] = {}
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RawField):
+            return self.data == other.data
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self.data == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(bytes(self.data))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({bytes(self.data)!r})"
+
+    def looks_like_message(self, /) -> bool:
+        result = self._cache.get("looks_like_message")
+        if result is None:
+            result = self._cache["looks_like_message"] = looks_like_message(self.data)
+        return result
+
+    def as_message(self, /) -> RawTree:
+        result = self._cache.get("message")
+        if result is None:
+            result = self._cache["message"] = loads_tree(self.data)
+        return result
+
+    def as_string(self, /) -> str:
+        result = self._cache.get("string")
+        if result is None:
+            result = self._cache["string"] = str(self.data, "utf-8")
+        return result
+
+    def as_packed(self, proto_type: ProtoType, /) -> list:
+        result = self._cache.get(proto_type)
+        if result is not None:
+            return result
+
+        data = self.data
+        wire_type = proto_type.wire_type()
+        if wire_type is WireType.LEN:
+            msg = f"{proto_type.name} cannot be packed"
+            raise TypeError(msg)
+
+        result = []
+        position = 0
+        size = _FIXED_SIZES.get(wire_type)
+        while position < len(data):
+            value: int | bytes
+            if size is None:
+                value, position = _decode_varint(data, position)
+            else:
+                end = position + size
+                if end > len(data):
+                    msg = (
+                        f"not enough data: expected {size}, got {len(data) - position}"
+                    )
+                    raise ValueError(msg)
+                value = bytes(data[position:end])
+                position = end
+            result.append(_convert(value, proto_type))
+
+        self._cache[proto_type] = result
+        return result
+
+
+def loads_tree(data: bytes | bytearray | memoryview, /) -> RawTree:
+    data = memoryview(data)
+    result: RawTree = {}
+    position = 0
+    while position < len(data):
+        tag, position = _decode_varint(data, position)
+        key, wire_type = tag >> 3, WireType(tag & 0b111)
+        start, position = _skip_value(data, position, wire_type)
+
+        value: int | bytes | RawField
+        if wire_type is WireType.VARINT:
+            value, _ = _decode_varint(data, start)
+        elif wire_type is WireType.LEN:
+            value = RawField(data[start:position])
+        else:
+            value = bytes(data[start:position])
+        result.setdefault(key, []).append(value)
+
+    return result
+
+
+def looks_like_message(data: bytes | bytearray | memoryview, /) -> bool:
+    position = 0
+    length = len(data)
+    while position < length:
+        # inlined varint decoding, nothing is allocated for valid data
+        tag = 0
+        shift = 0
+        while True:
+            if position >= length or shift > 63:
+                return False
+            byte = data[position]
+            position += 1
+            tag |= (byte & 0b0111_1111) << shift
+            if not byte & 0b1000_0000:
+                break
+            shift += 7
+
+        wire_type = tag & 0b111
+        if tag >> 3 == 0:
+            return False
+
+        if wire_type == WireType.VARINT:
+            while True:
+                if position >= length:
+                    return False
+                position += 1
+                if not data[position - 1] & 0b1000_0000:
+                    break
+
+        elif wire_type == WireType.I64:
+            position += 8
+
+        elif wire_type == WireType.I32:
+            position += 4
+
+        elif wire_type == WireType.LEN:
+            size = 0
+            shift = 0
+            while True:
+                if position >= length or shift > 63:
+                    return False
+                byte = data[position]
+                position += 1
+                size |= (byte & 0b0111_1111) << shift
+                if not byte & 0b1000_0000:
+                    break
+                shift += 7
+            position += size
+
+        else:
+            return False
+
+    return position == length
@@ -1,27 +1,69 @@
 from __future__ import annotations
 
+import array
 import dataclasses
 import io
+import itertools
+import mmap
+import shutil
+import tempfile
+import time
 import typing
 
+from protobug._core import _CACHE_ENCODING_NAME
 from protobug._core import _NAME_LOOKUP_NAME
 from protobug._core import ProtoMode
 from protobug._core import ProtoType
 from protobug._core import WireType
 from protobug._core import _double_struct
+from protobug._core import _encode_padded_varint
+from protobug._core import _encode_varint
 from protobug._core import _float_struct
+from protobug._core import _RawString
 from protobug._core import signed_to_zigzag
+from protobug._instrument import Instrumentation
+from protobug._lazy import LazyList
+from protobug._size import _value_size
+from protobug._size import byte_size
+from protobug._tracking import _adopt
 
 if typing.TYPE_CHECKING:
     from protobug._core import ProtoConversionInfo
 
 
 class Writer:
-    def __init__(self, writer: io.BufferedIOBase, /):
+    def __init__(
+        self,
+        writer: io.BufferedIOBase,
+        /,
+        *,
+        sizes: dict[int, tuple[typing.Any, int]] | None = None,
+        trusted: bool = False,
+        streaming: bool = False,
+    ):
+        if streaming and not writer.seekable():
+            msg = "streaming needs a seekable output"
+            raise ValueError(msg)
+
         self._position = 0
         self._writer = writer
+        self._sizes = sizes
+        self._trusted = trusted
+        self._streaming = streaming
+        # encodings of nested messages by id, see `_encode_nested`
+        self._encoded: dict[int, tuple[typing.Any, bytearray]] | None = None
 
     def write(self, value: typing.Any, /) -> int:
+        if self._encoded is not None or self._sizes is not None or self._streaming:
+            return self._write(value)
+
+        self._encoded = _encode_nested(value, self._trusted)
+        try:
+            return self._write(value)
+        finally:
+            self._encoded = None
+
+    def _write(self, value: typing.Any, /) -> int:
         # TODO(Grub4K): add support to write plain dict using a `py_type`
         py_type = type(value)
         schema: dict[str, ProtoConversionInfo] | None = getattr(
@@ -31,57 +73,144 @@ class Writer:
             msg = f"not a valid protobuf type: {py_type}"
             raise TypeError(msg)
 
+        if getattr(py_type, _CACHE_ENCODING_NAME, False):
+            state = vars(value)
+            encoded = state.get("_encoded")
+            if encoded is None:
+                buffer = bytearray()
+                writer = Writer(
+                    typing.cast("io.BufferedIOBase", _BufferWriter(buffer)),
+                    trusted=self._trusted,
+                )
+                writer._encoded = self._encoded
+                writer._write_message(value, schema)
+                encoded = state["_encoded"] = bytes(buffer)
+                _adopt_children(value, schema)
+            return self._writer.write(encoded)
+
+        return self._write_message(value, schema)
+
+    def _write_message(
+        self, value: typing.Any, schema: dict[str, ProtoConversionInfo], /
+    ) -> int:
+        py_type = type(value)
+        instrumentation = Instrumentation._active
+        if instrumentation is not None:
+            start_ns = time.perf_counter_ns()
+
         size = 0
+        fields = 0
         for field in dataclasses.fields(value):
             conversion_info = schema[field.name]
-            # Check if this field is defaulted
-            field_value = getattr(value, conversion_info.name)
-            if conversion_info.proto_mode is ProtoMode.Optional and (
-                field_value == field.default or field_value is None
-            ):
-                continue
-
-            if isinstance(field_value, list):
-                if (
-                    conversion_info.proto_mode is ProtoMode.Packed
-                    and len(field_value) > 2
-                ):
-                    # hahahahahahahahahahahahahahahahahahahahaha
-                    with io.BytesIO() as buffer:
-                        writer = Writer(buffer)
-                        for item in field_value:
-                            writer.write_type(item, conversion_info.proto_type)
-                        data = buffer.getvalue()
-
-                    size += self.write_tag(conversion_info.pid, WireType.LEN)
-                    size += self.write_varint(len(data))
-                    size += self._writer.write(data)
+            if conversion_info.lazy:
+                # bypass the descriptor, undecoded values are written as is
+                field_value = vars(value)[conversion_info.name]
+            else:
+                field_value = getattr(value, conversion_info.name)
+            field_size = self._write_field(conversion_info, field.default, field_value)
+            if field_size:
+                size += field_size
+                fields += 1
+
+        unknown = getattr(value, "_unknown", None)
+        if unknown:
+            size += self._writer.write(unknown)
+
+        if instrumentation is not None:
+            instrumentation.record(
+                "encode",
+                py_type,
+                size,
+                start_ns,
+                time.perf_counter_ns(),
+                fields=fields,
+                packed_elements=sum(
+                    len(getattr(value, info.name))
+                    for info in schema.values()
+                    if info.proto_mode is ProtoMode.Packed
+                ),
+            )
+
+        return size
+
+    def _write_field(
+        self,
+        conversion_info: ProtoConversionInfo,
+        default: typing.Any,
+        field_value: typing.Any,
+        /,
+    ) -> int:
+        # Check if this field is defaulted
+        if conversion_info.proto_mode is ProtoMode.Optional and (
+            field_value == default or field_value is None
+        ):
+            return 0
+
+        proto_type = conversion_info.proto_type
+        if isinstance(field_value, LazyList):
+            size = 0
+            for index in range(len(field_value)):
+                size += self.write_tag(conversion_info.pid, WireType.LEN)
+                # untouched items are copied from the original payload
+                raw = field_value._raw(index)
+                if raw is not None:
+                    size += self.write_varint(len(raw))
+                    size += self._writer.write(raw)
                     continue
 
+                item = field_value[index]
+                if not self._trusted:
+                    _validate((item,), proto_type, conversion_info.name)
+                size += self._write_type(item, proto_type)
+            return size
+
+        if isinstance(field_value, (list, tuple)):
+            if not self._trusted:
+                _validate(field_value, proto_type, conversion_info.name)
+
+            if conversion_info.proto_mode is ProtoMode.Packed and len(field_value) > 2:
+                length = sum(
+                    _value_size(item, proto_type, None) for item in field_value
+                )
+                size = self.write_tag(conversion_info.pid, WireType.LEN)
+                size += self.write_varint(length)
                 for item in field_value:
-                    size += self.write_tag(
-                        conversion_info.pid,
-                        conversion_info.proto_type.wire_type(),
-                    )
-                    size += self.write_type(item, conversion_info.proto_type)
-                continue
-
-            if isinstance(field_value, dict):
-                for k, v in field_value.items():
-                    map_item = conversion_info.py_type(k, v)
-                    size += self.write_tag(conversion_info.pid, WireType.LEN)
-                    size += self.write_type(map_item, ProtoType.Embed)
-                continue
-
-            size += self.write_tag(
-                conversion_info.pid,
-                conversion_info.proto_type.wire_type(),
-            )
-            size += self.write_type(field_value, conversion_info.proto_type)
+                    size += self._write_type(item, proto_type)
+                return size
 
+            size = 0
+            for item in field_value:
+                size += self.write_tag(conversion_info.pid, proto_type.wire_type())
+                size += self._write_type(item, proto_type)
+            return size
+
+        if isinstance(field_value, dict):
+            # map entries are validated by their own fields
+            size = 0
+            for k, v in field_value.items():
+                map_item = conversion_info.py_type(k, v)
+                size += self.write_tag(conversion_info.pid, WireType.LEN)
+                size += self._write_type(map_item, ProtoType.Embed)
+            return size
+
+        if type(field_value) is _RawString:
+            size = self.write_tag(conversion_info.pid, WireType.LEN)
+            size += self.write_varint(len(field_value))
+            return size + self._writer.write(field_value)
+
+        if not self._trusted:
+            _validate((field_value,), proto_type, conversion_info.name)
+
+        size = self.write_tag(conversion_info.pid, proto_type.wire_type())
+        size += self._write_type(field_value, proto_type)
         return size
 
     def write_type(self, value: typing.Any, proto_type: ProtoType, /) -> int:
+        if not self._trusted:
+            _validate((value,), proto_type, proto_type.name)
+        return self._write_type(value, proto_type)
+
+    def _write_type(self, value: typing.Any, proto_type: ProtoType, /) -> int:
         if proto_type in (
             ProtoType.Int32,
             ProtoType.Int64,
@@ -91,7 +220,6 @@ class Writer:
             ProtoType.SInt64,
             ProtoType.Enum,
         ):
-            assert isinstance(value, int), f"{type(value)=}"
             if proto_type in (ProtoType.Int32, ProtoType.Enum, ProtoType.Int64):
                 if value < 0:
                     value += 1
@@ -102,20 +230,15 @@ class Writer:
                     )
             elif proto_type in (ProtoType.SInt32, ProtoType.SInt64):
                 value = signed_to_zigzag(value)
-            else:
-                assert value >= 0
             return self.write_varint(value)
 
         if proto_type is ProtoType.Bool:
-            assert isinstance(value, bool)
             value = b"\x01" if value else b"\x00"
 
         elif proto_type is ProtoType.Float:
-            assert isinstance(value, float)
             value = _float_struct.pack(value)
 
         elif proto_type is ProtoType.Double:
-            assert isinstance(value, float)
             value = _double_struct.pack(value)
 
         elif proto_type in (
@@ -124,48 +247,328 @@ class Writer:
             ProtoType.SFixed32,
             ProtoType.SFixed64,
         ):
-            assert isinstance(value, int)
-            if proto_type in (ProtoType.Fixed32, ProtoType.Fixed64):
-                assert value >= 0
             length = 4 if proto_type in (ProtoType.Fixed32, ProtoType.SFixed32) else 8
-            value = value.to_bytes(length, "little", signed=True)
+            signed = proto_type in (ProtoType.SFixed32, ProtoType.SFixed64)
+            value = value.to_bytes(length, "little", signed=signed)
 
         elif proto_type is ProtoType.String:
-            assert isinstance(value, str)
             value = value.encode()
 
         elif proto_type is ProtoType.Embed:
-            # TODO(Grub4K): """streaming""" writer, he says
-            value = dumps(value)
+            if self._streaming:
+                return self._write_streamed(value)
+            if self._sizes is not None:
+                size = self.write_varint(byte_size(value, sizes=self._sizes))
+                return size + self.write(value)
+            entry = (
+                None if self._encoded is None else self._encoded.pop(id(value), None)
+            )
+            if entry is not None and entry[0] is value:
+                value = entry[1]
+            else:
+                # the length is only known once the message is encoded
+                value = dumps(value, trusted=self._trusted)
 
-        assert isinstance(value, bytes)
         size = 0
         if proto_type.wire_type() is WireType.LEN:
             size += self.write_varint(len(value))
         size += self._writer.write(value)
         return size
 
+    def _write_streamed(self, value: typing.Any, /) -> int:
+        # reserve a fixed width length and patch it once the size is known
+        start = self._writer.tell()
+        self._writer.write(_LENGTH_PLACEHOLDER)
+        length = self.write(value)
+        if length >= 1 << 7 * len(_LENGTH_PLACEHOLDER):
+            msg = f"message too large for streaming: {length}"
+            raise ValueError(msg)
+
+        end = self._writer.tell()
+        self._writer.seek(start)
+        self._writer.write(_encode_padded_varint(length, len(_LENGTH_PLACEHOLDER)))
+        self._writer.seek(end)
+        return len(_LENGTH_PLACEHOLDER) + length
+
     def write_tag(self, pid: int, wire_type: WireType, /) -> int:
         result = (pid << 3) | wire_type
         return self.write_varint(result)
 
     def write_varint(self, value: int, /) -> int:
-        size = ((value.bit_length() - 1) // 7 + 1) or 1
-        buffer = bytearray(size)
+        return self._writer.write(_encode_varint(value))
+
+
+def _encode_nested(
+    value: typing.Any, trusted: bool, /
+) -> dict[int, tuple[typing.Any, bytearray]]:
+    # encode nested messages innermost first, so that writing does not recurse
+    children = _nested(value)
+    first = next(children, None)
+    if first is None:
+        return {}
+
+    order = []
+    seen = {id(value)}
+    stack: list[tuple[typing.Any, typing.Iterator[typing.Any]]] = [
+        (value, itertools.chain((first,), children))
+    ]
+    while stack:
+        item, children = stack[-1]
+        for child in children:
+            if id(child) not in seen:
+                seen.add(id(child))
+                stack.append((child, _nested(child)))
+                break
+        else:
+            stack.pop()
+            order.append(item)
+
+    encoded: dict[int, tuple[typing.Any, bytearray]] = {}
+    # the outermost message is written by the caller
+    for item in order[:-1]:
+        buffer = bytearray()
+        writer = Writer(
+            typing.cast("io.BufferedIOBase", _BufferWriter(buffer)), trusted=trusted
+        )
+        writer._encoded = encoded
+        writer._write(item)
+        encoded[id(item)] = item, buffer
+    return encoded
+
+
+def _nested(value: typing.Any, /) -> typing.Iterator[typing.Any]:
+    py_type = type(value)
+    schema: dict[str, ProtoConversionInfo] | None = getattr(
+        py_type, _NAME_LOOKUP_NAME, None
+    )
+    if not schema:
+        return
+    if getattr(py_type, _CACHE_ENCODING_NAME, False) and vars(value).get("_encoded"):
+        return
+
+    for info in schema.values():
+        if info.proto_type is not ProtoType.Embed:
+            continue
+        field_value = vars(value)[info.name] if info.lazy else getattr(value, info.name)
+        if field_value is None:
+            continue
+        if isinstance(field_value, LazyList):
+            # untouched items are copied from the original payload
+            yield from (item for item in field_value._items if item is not None)
+        elif isinstance(field_value, (list, tuple)):
+            yield from field_value
+        # map entries are created while writing and encode their own values
+        elif not isinstance(field_value, dict):
+            yield field_value
+
 
-        for i in range(size - 1):
-            buffer[i] = (value & 0b0111_1111) | 0b1000_0000
-            value >>= 7
+def _adopt_children(
+    value: typing.Any, schema: dict[str, ProtoConversionInfo], /
+) -> None:
+    # let nested messages invalidate the cached encoding of their parent
+    for info in schema.values():
+        if info.proto_type is not ProtoType.Embed:
+            continue
+        field_value = getattr(value, info.name)
+        if isinstance(field_value, dict):
+            children: typing.Iterable[typing.Any] = field_value.values()
+        elif isinstance(field_value, (list, tuple)):
+            children = field_value
+        else:
+            children = (field_value,)
+        for child in children:
+            if getattr(type(child), _CACHE_ENCODING_NAME, False):
+                _adopt(value, child)
 
-        buffer[-1] = value
-        return self._writer.write(buffer)
 
+_LENGTH_PLACEHOLDER = bytes(5)
 
-def dump(data: typing.Any, file: io.BufferedIOBase, /) -> int:
-    return Writer(file).write(data)
 
+_INT_RANGES = {
+    ProtoType.Int32: (-(1 << 31), 1 << 31),
+    ProtoType.Int64: (-(1 << 63), 1 << 63),
+    ProtoType.UInt32: (0, 1 << 32),
+    ProtoType.UInt64: (0, 1 << 64),
+    ProtoType.SInt32: (-(1 << 31), 1 << 31),
+    ProtoType.SInt64: (-(1 << 63), 1 << 63),
+    ProtoType.Enum: (-(1 << 31), 1 << 31),
+    ProtoType.Fixed32: (0, 1 << 32),
+    ProtoType.Fixed64: (0, 1 << 64),
+    ProtoType.SFixed32: (-(1 << 31), 1 << 31),
+    ProtoType.SFixed64: (-(1 << 63), 1 << 63),
+}
 
-def dumps(data: typing.Any, /) -> bytes:
+_PY_TYPES: dict[ProtoType, type | tuple[type, ...]] = {
+    ProtoType.Bool: bool,
+    ProtoType.Float: float,
+    ProtoType.Double: float,
+    ProtoType.String: str,
+    ProtoType.Bytes: (bytes, bytearray, memoryview),
+}
+
+
+def _validate(
+    values: typing.Sequence[typing.Any], proto_type: ProtoType, name: str, /
+) -> None:
+    if not values:
+        return
+
+    bounds = _INT_RANGES.get(proto_type)
+    py_type = int if bounds is not None else _PY_TYPES.get(proto_type)
+    if py_type is None:
+        # embedded messages are validated when they are written
+        return
+
+    for value in values:
+        if not isinstance(value, py_type):
+            msg = (
+                f"{name}: expected {proto_type.name} value, got {type(value).__name__}"
+            )
+            raise TypeError(msg)
+
+    if bounds is None:
+        return
+
+    low, high = bounds
+    for value in (min(values), max(values)):
+        if not low <= value < high:
+            msg = f"{name}: value out of range for {proto_type.name}: {value}"
+            raise ValueError(msg)
+
+
+class _BufferWriter:
+    __slots__ = ("buffer",)
+
+    def __init__(self, buffer: bytearray, /):
+        self.buffer = buffer
+
+    def write(self, data: bytes | bytearray | memoryview, /) -> int:
+        self.buffer += data
+        return len(data)
+
+
+class _ViewWriter:
+    __slots__ = ("position", "view")
+
+    def __init__(self, view: memoryview, position: int, /):
+        self.view = view
+        self.position = position
+
+    def write(self, data: bytes | bytearray | memoryview, /) -> int:
+        end = self.position + len(data)
+        self.view[self.position : end] = data
+        self.position = end
+        return len(data)
+
+
+class _ChunkWriter:
+    __slots__ = ("_current", "chunks", "threshold")
+
+    def __init__(self, threshold: int, /):
+        self.chunks: list[bytes | bytearray | memoryview] = []
+        self.threshold = threshold
+        self._current = bytearray()
+
+    def write(self, data: bytes | bytearray | memoryview, /) -> int:
+        size = len(data)
+        if size < self.threshold:
+            self._current += data
+            return size
+
+        # large payloads are passed through by reference
+        if self._current:
+            self.chunks.append(self._current)
+            self._current = bytearray()
+        self.chunks.append(data)
+        return size
+
+    def finish(self, /) -> list[bytes | bytearray | memoryview]:
+        if self._current:
+            self.chunks.append(self._current)
+            self._current = bytearray()
+        return self.chunks
+
+
+def dump(
+    data: typing.Any,
+    file: io.BufferedIOBase,
+    /,
+    *,
+    sizes: dict[int, tuple[typing.Any, int]] | None = None,
+    trusted: bool = False,
+    streaming: bool = False,
+) -> int:
+    if streaming and not file.seekable():
+        # spill to disk so the lengths can still be patched
+        with tempfile.TemporaryFile() as spill:
+            size = Writer(spill, trusted=trusted, streaming=True).write(data)
+            spill.seek(0)
+            shutil.copyfileobj(spill, file)
+        return size
+
+    return Writer(file, sizes=sizes, trusted=trusted, streaming=streaming).write(data)
+
+
+def dumps(
+    data: typing.Any,
+    /,
+    *,
+    sizes: dict[int, tuple[typing.Any, int]] | None = None,
+    trusted: bool = False,
+) -> bytes:
     with io.BytesIO() as buffer:
-        Writer(buffer).write(data)
+        Writer(buffer, sizes=sizes, trusted=trusted).write(data)
         return buffer.getvalue()
+
+
+def dumps_many(
+    messages: typing.Iterable[typing.Any], /, *, trusted: bool = False
+) -> tuple[bytearray, array.array]:
+    buffer = bytearray()
+    offsets = array.array("Q", [0])
+    writer = Writer(
+        typing.cast("io.BufferedIOBase", _BufferWriter(buffer)), trusted=trusted
+    )
+    for message in messages:
+        writer.write(message)
+        offsets.append(len(buffer))
+    return buffer, offsets
+
+
+def dumps_chunks(
+    data: typing.Any, /, *, threshold: int = 4096, trusted: bool = False
+) -> list[bytes | bytearray | memoryview]:
+    writer = _ChunkWriter(threshold)
+    # embedded messages need known sizes to be streamed instead of copied
+    Writer(typing.cast("io.BufferedIOBase", writer), sizes={}, trusted=trusted).write(
+        data
+    )
+    return writer.finish()
+
+
+def dump_into(
+    data: typing.Any,
+    buffer: bytearray | memoryview | mmap.mmap,
+    offset: int = 0,
+    /,
+    *,
+    trusted: bool = False,
+) -> int:
+    sizes: dict[int, tuple[typing.Any, int]] = {}
+    size = byte_size(data, sizes=sizes)
+    with memoryview(buffer) as view, view.cast("B") as target:
+        if target.readonly:
+            msg = "cannot write into a read-only buffer"
+            raise TypeError(msg)
+
+        available = len(target) - offset
+        if offset < 0 or size > available:
+            msg = f"not enough space: expected {size}, got {max(available, 0)}"
+            raise ValueError(msg)
+
+        writer = _ViewWriter(target, offset)
+        Writer(
+            typing.cast("io.BufferedIOBase", writer), sizes=sizes, trusted=trusted
+        ).write(data)
+
+    return size
@@ -50,3 +50,52 @@ class Message7:
 @protobug.message
 class Message8:
     i: protobug.Float = protobug.field(9)
+
+
+@protobug.message
+class Message9:
+    j: protobug.Bytes = protobug.field(10)
+
+
+@protobug.message
+class Message10:
+    k: protobug.Bytes = protobug.field(11)
+    m: typing.Union[Message9, None] = protobug.field(12, default=None)
+
+
+@protobug.message
+class Message11:
+    n: protobug.LazyList[Message1] = protobug.field(
+        13, default_factory=protobug.LazyList
+    )
+
+
+@protobug.message
+class Message12:
+    o: protobug.String = protobug.field(14, lazy=True)
+    p: typing.Union[protobug.String, None] = protobug.field(15, default=None, lazy=True)
+
+
+@protobug.message
+class Message13:
+    q: list[Message1] = protobug.field(16, default_factory=list)
+    r: typing.Union[protobug.Int32, None] = protobug.field(17, default=None)
+
+
+@protobug.message(frozen=True)
+class Message14:
+    s: tuple[protobug.Int32, ...] = protobug.field(18, default=())
+    t: dict[protobug.String, protobug.Int32] = protobug.field(19, default_factory=dict)
+
+
+@protobug.message
+class Message15:
+    u: protobug.Fixed32 = protobug.field(20, default=0)
+    v: protobug.Fixed64 = protobug.field(21, default=0)
+    w: protobug.SFixed32 = protobug.field(22, default=0)
+    x: protobug.SFixed64 = protobug.field(23, default=0)
+
+
+@protobug.message(frozen=True)
+class Message16:
+    y: tuple[Message14, ...] = protobug.field(24, default=())
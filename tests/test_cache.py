@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+import protobug
+import tests.model
+
+
+def test_decode_cache() -> None:
+    cache = protobug.DecodeCache(max_bytes=8)
+    first = protobug.loads(b"\x92\x01\x01\x01", tests.model.Message14, cache=cache)
+    second = protobug.loads(
+        bytearray(b"\x92\x01\x01\x01"), tests.model.Message14, cache=cache
+    )
+    assert first is second
+    assert (cache.hits, cache.misses, len(cache), cache.size) == (1, 1, 1, 4)
+
+    other = protobug.loads(b"\x92\x01\x01\x02", tests.model.Message14, cache=cache)
+    assert other.s == (2,)
+    assert (len(cache), cache.size) == (2, 8)
+
+    # the least recently used payload is evicted first
+    protobug.loads(b"\x92\x01\x01\x01", tests.model.Message14, cache=cache)
+    protobug.loads(b"\x92\x01\x01\x03", tests.model.Message14, cache=cache)
+    assert (
+        protobug.loads(b"\x92\x01\x01\x01", tests.model.Message14, cache=cache) is first
+    )
+    assert (cache.hits, cache.misses, len(cache)) == (3, 3, 2)
+
+    # payloads over the limit are not cached
+    protobug.loads(
+        b"\x92\x01\x07\x01\x02\x03\x04\x05\x06\x07", tests.model.Message14, cache=cache
+    )
+    assert len(cache) == 2
+
+    cache.clear()
+    assert (len(cache), cache.size) == (0, 0)
+
+    with pytest.raises(TypeError, match="decode cache needs a frozen message type"):
+        protobug.loads(b"", tests.model.Message1, cache=cache)
+
+    @dataclasses.dataclass(frozen=True)
+    class Plain:
+        a: int = 0
+
+    with pytest.raises(TypeError, match="decode cache needs a frozen message type"):
+        protobug.loads(b"", Plain, cache=cache)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import array
+
+import pytest
+
+import protobug
+import tests.model
+
+
+@protobug.message
+class ColumnMessage:
+    flag: protobug.Bool = protobug.field(1)
+    kind: tests.model.MessageEnum = protobug.field(2)
+
+
+def test_loads_columnar() -> None:
+    payloads = [
+        b"\x22\x05hello\x2a\x03\x01\x02\x03",
+        b"\x28\x04",
+        b"\x22\x05world",
+    ]
+    columns = protobug.loads_columnar(payloads, tests.model.Message4)
+    assert columns.length == 3
+    assert columns.values == {
+        "d": ["hello", None, "world"],
+        "e": [[1, 2, 3], [4], []],
+    }
+    assert columns.present == {"d": bytearray([1, 0, 1])}
+
+    columns = protobug.loads_columnar(
+        [b"\x08\x96\x01", b"", b"\x08\x01"], tests.model.Message1
+    )
+    assert columns.values == {"a": array.array("q", [150, 0, 1])}
+    assert columns.present == {"a": bytearray([1, 0, 1])}
+
+    columns = protobug.loads_columnar([b"\x72\x02\xce\xbb"], tests.model.Message12)
+    assert columns.values == {"o": ["λ"], "p": [None]}
+
+    columns = protobug.loads_columnar([b"\x4d\x00\x00\x80\x3f"], tests.model.Message8)
+    assert columns.values == {"i": array.array("f", [1.0])}
+    assert columns.present == {}
+
+
+def test_loads_columnar_errors() -> None:
+    with pytest.raises(TypeError, match="missing required field 'b'"):
+        protobug.loads_columnar([b""], tests.model.Message2)
+
+    with pytest.raises(TypeError, match="not a valid protobuf type"):
+        protobug.loads_columnar([b""], int)
+
+
+def test_dumps_columnar() -> None:
+    payloads = [
+        b"\x22\x05hello\x2a\x03\x01\x02\x03",
+        b"\x28\x04",
+        b"\x22\x05world",
+    ]
+    columns = protobug.loads_columnar(payloads, tests.model.Message4)
+    buffer, offsets = protobug.dumps_columnar(columns, tests.model.Message4)
+    assert bytes(buffer) == b"".join(payloads)
+    assert offsets.tolist() == [0, 12, 14, 21]
+
+    columns = protobug.loads_columnar(
+        [b"\x08\x96\x01", b"", b"\x08\x01"], tests.model.Message1
+    )
+    buffer, offsets = protobug.dumps_columnar(columns, tests.model.Message1)
+    assert bytes(buffer) == b"\x08\x96\x01\x08\x01"
+    assert offsets.tolist() == [0, 3, 3, 5]
+
+    payloads = [b"\x08\xff\xff\xff\xff\x0f"]
+    columns = protobug.loads_columnar(payloads, tests.model.Message1)
+    assert columns.values == {"a": array.array("q", [-1])}
+    buffer, _ = protobug.dumps_columnar(columns, tests.model.Message1)
+    assert bytes(buffer) == payloads[0]
+
+    payloads = [b"\x08\x01\x10\x02", b"\x08\x00\x10\x01"]
+    columns = protobug.loads_columnar(payloads, ColumnMessage)
+    assert columns.values == {
+        "flag": array.array("B", [1, 0]),
+        "kind": array.array("q", [2, 1]),
+    }
+    buffer, offsets = protobug.dumps_columnar(columns, ColumnMessage)
+    assert bytes(buffer) == b"".join(payloads)
+    assert offsets.tolist() == [0, 4, 8]
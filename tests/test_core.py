@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import copy
+import dataclasses
+import pickle
 import typing
 
 import pytest
 
 import protobug
+import tests.model
 
 
 class Test1:
@@ -164,3 +168,98 @@ def test_annotation_resolving() -> None:
             A = 1
 
         nested: Message4Nested | None = protobug.field(1, default=None)
+
+
+def test_pickle() -> None:
+    message = protobug.loads(b"\x1a\x03\x08\x96\x01\x00\x00", tests.model.Message3)
+    assert message.__reduce__() == (
+        protobug.loads,
+        (b"\x1a\x03\x08\x96\x01\x00\x00", tests.model.Message3),
+    )
+    result = pickle.loads(pickle.dumps(message))
+    assert result == message
+    assert getattr(result, "_unknown") == b"\x00\x00"
+
+    @protobug.message(pickle=False)
+    class Inner:
+        a: protobug.Int32 = protobug.field(1)
+
+    @protobug.message(pickle=False)
+    class Outer:
+        inner: Inner = protobug.field(1)
+
+    outer = Outer(Inner(1))
+    assert "__reduce__" not in vars(Outer)
+    assert protobug.loads(protobug.dumps(outer), Outer) == outer
+
+    negative = tests.model.Message3(tests.model.Message1(-1))
+    assert pickle.loads(pickle.dumps(negative)) == negative
+
+    # values that the wire format cannot keep are pickled field by field
+    for lossy in (tests.model.Message8(0.1), tests.model.Message2(b=None)):  # type: ignore[arg-type]
+        assert lossy.__reduce__()[0] is not protobug.loads
+        assert pickle.loads(pickle.dumps(lossy)) == lossy
+    assert tests.model.Message8(0.5).__reduce__()[0] is protobug.loads
+
+
+def test_copy() -> None:
+    message = protobug.loads(b"\x1a\x02\x08\x01\x00\x00", tests.model.Message3)
+    shallow = copy.copy(message)
+    assert shallow == message
+    assert shallow.c is message.c
+    assert getattr(shallow, "_unknown") == b"\x00\x00"
+
+    deep = copy.deepcopy(message)
+    assert deep == message
+    assert deep.c is not message.c
+
+    partial = tests.model.Message2(b=None)  # type: ignore[arg-type]
+    assert copy.copy(partial) == partial
+    assert copy.deepcopy(partial) == partial
+
+
+def test_frozen() -> None:
+    data = b"\x92\x01\x03\x01\x02\x03\x9a\x01\x05\x0a\x01a\x10\x01"
+    message = protobug.loads(data, tests.model.Message14)
+    assert message == tests.model.Message14(s=(1, 2, 3), t={"a": 1})
+    assert hash(message) == hash(tests.model.Message14(s=(1, 2, 3), t={"a": 1}))
+    assert tests.model.Message14(s=[1], t={}).s == (1,)  # type: ignore[arg-type]
+    assert protobug.dumps(message) == data
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.s = ()  # type: ignore[misc]
+    with pytest.raises(TypeError, match="object is immutable"):
+        message.t["b"] = 2
+
+    for frozen_map in (pickle.loads(pickle.dumps(message.t)), copy.deepcopy(message.t)):
+        assert frozen_map == {"a": 1}
+        assert type(frozen_map) is type(message.t)
+    assert copy.deepcopy(message) == message
+
+    @protobug.message(frozen=True)
+    class Inner:
+        a: protobug.Int32 = protobug.field(1)
+
+    @protobug.message(frozen=True)
+    class Outer:
+        inner: Inner = protobug.field(1)
+        inners: dict[protobug.String, Inner] = protobug.field(2, default_factory=dict)
+
+    outer = Outer(Inner(1), {"a": Inner(2)})
+    assert hash(outer) == hash(Outer(Inner(1), {"a": Inner(2)}))
+
+    with pytest.raises(TypeError, match="Mutable needs frozen as well"):
+
+        @protobug.message
+        class Mutable:
+            a: protobug.Int32 = protobug.field(1)
+
+        @protobug.message(frozen=True)
+        class Invalid:
+            inner: Mutable = protobug.field(1)
+
+    with pytest.raises(TypeError, match="Mutable needs frozen as well"):
+
+        @protobug.message(frozen=True)
+        class InvalidMap:
+            inners: dict[protobug.String, Mutable] = protobug.field(1)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+import protobug
+import tests.model
+
+
+@protobug.message
+class Wrapper:
+    inner: tests.model.Message13 = protobug.field(1)
+
+
+def test_decoder() -> None:
+    data = b"\x22\x05hello\x2a\x03\x01\x02\x03\x00\x00"
+    decoder = protobug.Decoder(tests.model.Message4)
+    for index in range(len(data)):
+        assert decoder.feed(data[index : index + 1]) == []
+
+    (message,) = decoder.close()
+    assert message == tests.model.Message4(d="hello", e=[1, 2, 3])
+    assert getattr(message, "_unknown") == b"\x00\x00"
+
+    decoder = protobug.Decoder()
+    assert decoder.feed(b"\x08\x96") == []
+    assert decoder.feed(b"\x01\x08") == []
+    with pytest.raises(ValueError, match="incomplete data: 1 bytes left over"):
+        decoder.close()
+
+    decoder = protobug.Decoder(tests.model.Message1)
+    assert decoder.feed(b"\x08\x01") == []
+    with pytest.raises(ValueError, match="invalid wire type: 7"):
+        decoder.feed(b"\x0f\x00\x00")
+
+
+def test_decoder_delimited() -> None:
+    frames = b"\x03\x08\x96\x01\x00\x02\x08\x01"
+    decoder = protobug.Decoder(tests.model.Message1, delimited=True)
+    assert decoder.feed(frames[:2]) == []
+    assert decoder.feed(frames[2:6]) == [
+        tests.model.Message1(a=150),
+        tests.model.Message1(),
+    ]
+    assert decoder.feed(frames[6:]) == [tests.model.Message1(a=1)]
+    assert decoder.close() == []
+
+    decoder = protobug.Decoder(delimited=True)
+    assert decoder.feed(frames + b"\x03\x08") == [{1: [150]}, {}, {1: [1]}]
+    with pytest.raises(ValueError, match="incomplete data"):
+        decoder.close()
+
+    decoder = protobug.Decoder(delimited=True)
+    with pytest.raises(ValueError, match="non matching data length: expected 2"):
+        decoder.feed(b"\x02\x12\x05hello")
+
+
+def test_decoder_nested() -> None:
+    message = Wrapper(
+        tests.model.Message13([tests.model.Message1(a=i) for i in range(100)], 5)
+    )
+    data = protobug.dumps(message)
+    decoder = protobug.Decoder(Wrapper)
+    for index in range(len(data)):
+        assert decoder.feed(data[index : index + 1]) == []
+        # only the current record of the innermost message is buffered
+        assert len(decoder._buffer) < 8
+    assert decoder.close() == [message]
+
+    decoder = protobug.Decoder(Wrapper, delimited=True)
+    with io.BytesIO() as buffer:
+        protobug.Writer(buffer).write_varint(len(data))
+        frames = buffer.getvalue() + data
+    assert decoder.feed(frames[:100]) == []
+    assert decoder.feed(frames[100:] + frames) == [message, message]
+    assert decoder.close() == []
+
+    decoder = protobug.Decoder(Wrapper)
+    assert decoder.feed(data[:10]) == []
+    with pytest.raises(ValueError, match="nested messages left open"):
+        decoder.close()
+
+    decoder = protobug.Decoder(Wrapper, delimited=True)
+    with pytest.raises(ValueError, match="non matching data length: expected 3"):
+        decoder.feed(b"\x03\x0a\x05\x80")
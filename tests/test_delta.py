@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+import protobug
+import tests.model
+
+
+def test_delta_singular() -> None:
+    old = tests.model.Message4("old", [1, 2])
+    new = tests.model.Message4("new", [1, 2])
+    delta = protobug.diff(old, new)
+    assert protobug.apply(old, delta) == new
+    assert protobug.apply(old, protobug.diff(old, old)) == old
+    assert protobug.diff(old, old) == b""
+
+    cleared = tests.model.Message4(None, [1, 2])
+    assert protobug.apply(old, protobug.diff(old, cleared)) == cleared
+
+
+def test_delta_repeated() -> None:
+    old = tests.model.Message4(e=[1, 2, 3])
+    for items in ([1, 2, 3, 4, 5], [1, 2], [1, 5, 3], [], [4]):
+        new = tests.model.Message4(e=items)
+        assert protobug.apply(old, protobug.diff(old, new)) == new
+
+    # appends only carry the new items
+    long = tests.model.Message4(e=list(range(100)))
+    longer = tests.model.Message4(e=list(range(101)))
+    assert protobug.diff(long, longer) == b"\n\x06\x08\x05\x12\x02(d"
+
+
+def test_delta_lazy() -> None:
+    old = protobug.loads(b"\x72\x02\xce\xbb\x7a\x01a", tests.model.Message12)
+    assert protobug.diff(old, tests.model.Message12("λ", "a")) == b""
+
+    new = tests.model.Message12("λ", "b")
+    result = protobug.apply(old, protobug.diff(old, new))
+    assert result == new
+    assert vars(old)["p"] == b"a"
+
+
+def test_delta_map() -> None:
+    old = tests.model.Message6({"a": 1, "b": 2, "c": 3})
+    new = tests.model.Message6({"a": 1, "b": 5, "d": 4})
+    assert protobug.apply(old, protobug.diff(old, new)) == new
+
+
+def test_delta_nested() -> None:
+    old = tests.model.Message13([tests.model.Message1(1)], 2)
+    new = tests.model.Message13([tests.model.Message1(1), tests.model.Message1()], 2)
+    assert protobug.apply(old, protobug.diff(old, new)) == new
+
+    old_embed = tests.model.Message10(b"k", tests.model.Message9(b"a"))
+    new_embed = tests.model.Message10(b"k", tests.model.Message9(b"b"))
+    assert protobug.apply(old_embed, protobug.diff(old_embed, new_embed)) == new_embed
+    assert (
+        protobug.apply(
+            tests.model.Message10(b"k"),
+            protobug.diff(tests.model.Message10(b"k"), new_embed),
+        )
+        == new_embed
+    )
+    assert protobug.apply(
+        new_embed, protobug.diff(new_embed, tests.model.Message10(b"k"))
+    ) == tests.model.Message10(b"k")
+
+
+def test_delta_frozen() -> None:
+    old = tests.model.Message14((1, 2), {"a": 1})
+    new = tests.model.Message14((1, 3), {"b": 2})
+    result = protobug.apply(old, protobug.diff(old, new))
+    assert result == new
+    assert isinstance(result.s, tuple)
+
+
+def test_delta_unknown() -> None:
+    old = protobug.loads(b"\x08\x01", tests.model.Message4)
+    new = tests.model.Message4()
+    result = protobug.apply(old, protobug.diff(old, new))
+    assert protobug.dumps(result) == b""
+    assert protobug.dumps(protobug.apply(new, protobug.diff(new, old))) == b"\x08\x01"
+
+
+def test_delta_invalid() -> None:
+    with pytest.raises(TypeError, match="cannot diff Message1 with Message2"):
+        protobug.diff(tests.model.Message1(), tests.model.Message2("b"))
+
+    with pytest.raises(TypeError, match="not a valid protobuf type"):
+        protobug.diff(1, 2)
+
+    delta = protobug.diff(tests.model.Message4(e=[1]), tests.model.Message4(e=[2]))
+    with pytest.raises(ValueError, match="unknown field id: 5"):
+        protobug.apply(tests.model.Message1(), delta)
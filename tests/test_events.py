@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+import protobug
+import tests.model
+
+VARINT = protobug.WireType.VARINT
+LEN = protobug.WireType.LEN
+START = protobug.EventMarker.START
+END = protobug.EventMarker.END
+
+
+def test_iter_events() -> None:
+    data = b"\x1a\x05\x08\x96\x01\x00\x00\x20\x01"
+    assert list(protobug.iter_events(data)) == [
+        (3, LEN, b"\x08\x96\x01\x00\x00"),
+        (4, VARINT, 1),
+    ]
+    assert list(protobug.iter_events(data, tests.model.Message3)) == [
+        (3, START, tests.model.Message1),
+        (1, VARINT, 150),
+        (0, VARINT, 0),
+        (3, END, tests.model.Message1),
+        (4, VARINT, 1),
+    ]
+
+    data = b"\x22\x05hello\x2a\x03\x01\x02\x03\x28\x04"
+    assert list(protobug.iter_events(data, tests.model.Message4)) == [
+        (4, LEN, b"hello"),
+        (5, VARINT, 1),
+        (5, VARINT, 2),
+        (5, VARINT, 3),
+        (5, VARINT, 4),
+    ]
+
+    map_type = getattr(tests.model.Message6, "__protobug_pid_lookup")[7].py_type
+    data = b"\x3a\x05\x0a\x01a\x10\x01"
+    assert list(protobug.iter_events(data, tests.model.Message6)) == [
+        (7, START, map_type),
+        (1, LEN, b"a"),
+        (2, VARINT, 1),
+        (7, END, map_type),
+    ]
+
+
+def test_iter_events_errors() -> None:
+    with pytest.raises(ValueError, match="not enough data: expected 2, got 1"):
+        list(protobug.iter_events(b"\x1a\x02\x08\x96\x01", tests.model.Message3))
+
+    with pytest.raises(ValueError, match="non-matching packed length"):
+        list(protobug.iter_events(b"\x32\x01\x96\x01", tests.model.Message5))
+
+    with pytest.raises(ValueError, match="unexpected value type for a"):
+        list(protobug.iter_events(b"\x0a\x00", tests.model.Message1))
+
+    with pytest.raises(ValueError, match="not enough data"):
+        list(protobug.iter_events(b"\x12\x07test"))
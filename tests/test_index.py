@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+import pathlib
+
+import pytest
+
+import protobug
+import tests.model
+
+
+def _records(messages: list, records_per_block: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with protobug.RecordWriter(buffer, records_per_block=records_per_block) as writer:
+        for message in messages:
+            writer.write(message)
+    return buffer.getvalue()
+
+
+def test_field_index(tmp_path: pathlib.Path) -> None:
+    values = [5, 3, None, 8, 3, 1]
+    data = _records([tests.model.Message1(a=value) for value in values])
+    reader = protobug.RecordReader(data, tests.model.Message1)
+
+    path = tmp_path / "a.pbi"
+    with path.open("wb") as file:
+        assert protobug.build_index(reader, 1, file) == 5
+
+    with protobug.FieldIndex(path) as index:
+        assert len(index) == 5
+        assert index.lookup(3) == [1, 4]
+        assert index.lookup(8) == [3]
+        assert index.lookup(4) == []
+        assert index.lookup(-1) == []
+        assert index.lookup_range(3, 8) == [1, 4, 0]
+        assert index.lookup_range(None, 4) == [5, 1, 4]
+        assert index.lookup_range(5) == [0, 3]
+        assert [reader[number].a for number in index.lookup_range(3, 8)] == [3, 3, 5]
+
+
+def test_field_index_repeated() -> None:
+    messages = [
+        tests.model.Message4(e=[1, 2, 3]),
+        tests.model.Message4(d="x", e=[2]),
+        tests.model.Message4(e=[3, 4, 5, 6]),
+    ]
+    reader = protobug.RecordReader(_records(messages), tests.model.Message4)
+    buffer = io.BytesIO()
+    assert protobug.build_index(reader, 5, buffer) == 8
+
+    index = protobug.FieldIndex(buffer.getvalue())
+    assert index.lookup(2) == [0, 1]
+    assert index.lookup(3) == [0, 2]
+    assert index.lookup_range(4, 7) == [2, 2, 2]
+
+
+def test_field_index_signed() -> None:
+    values = [5, -3, 0, -(1 << 31), 7]
+    data = _records([tests.model.Message1(a=value) for value in values])
+    reader = protobug.RecordReader(data, tests.model.Message1)
+    buffer = io.BytesIO()
+    assert protobug.build_index(reader, 1, buffer) == 5
+
+    index = protobug.FieldIndex(buffer.getvalue())
+    assert index.lookup(-3) == [1]
+    assert index.lookup_range(-5, 6) == [1, 2, 0]
+    assert index.lookup_range(None, 0) == [3, 1]
+
+
+def test_field_index_variable() -> None:
+    names = ["bob", "alice", "λ", "carol", "alice"]
+    data = _records([tests.model.Message2(b=name) for name in names])
+    reader = protobug.RecordReader(data, tests.model.Message2)
+    buffer = io.BytesIO()
+    assert protobug.build_index(reader, 2, buffer) == 5
+
+    index = protobug.FieldIndex(buffer.getvalue())
+    assert len(index) == 5
+    assert index.lookup("alice") == [1, 4]
+    assert index.lookup("λ") == [2]
+    assert index.lookup("dave") == []
+    assert index.lookup_range("b", "d") == [0, 3]
+    assert index.lookup_range("c") == [3, 2]
+
+    data = _records([tests.model.Message9(j=key) for key in (b"\x02", b"\x01")])
+    bytes_reader = protobug.RecordReader(data, tests.model.Message9)
+    buffer = io.BytesIO()
+    protobug.build_index(bytes_reader, 10, buffer)
+    index = protobug.FieldIndex(buffer.getvalue())
+    assert index.lookup(bytearray(b"\x01")) == [1]
+    assert index.lookup_range(b"\x01") == [1, 0]
+
+
+def test_field_index_errors() -> None:
+    reader = protobug.RecordReader(_records([]), tests.model.Message4)
+    with pytest.raises(ValueError, match="unknown field id: 1"):
+        protobug.build_index(reader, 1, io.BytesIO())
+
+    embed_reader = protobug.RecordReader(_records([]), tests.model.Message3)
+    with pytest.raises(TypeError, match="c: cannot index Embed field"):
+        protobug.build_index(embed_reader, 3, io.BytesIO())
+
+    with pytest.raises(ValueError, match="not a protobug index file"):
+        protobug.FieldIndex(b"PBR1")
+
+    with pytest.raises(ValueError, match="truncated index file"):
+        protobug.FieldIndex(b"PBI2q\0\0\0\x01\0\0\0\0\0\0\0")
+
+    with pytest.raises(ValueError, match="truncated index file"):
+        protobug.FieldIndex(
+            b"PBI2s\0\0\0\x01\0\0\0\0\0\0\0" + bytes(8) + b"\x05" + bytes(15)
+        )
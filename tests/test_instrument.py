@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import protobug
+import tests.model
+
+
+def test_instrumentation() -> None:
+    assert protobug.get_instrumentation() is None
+
+    spans: list[tuple[str, type, int]] = []
+    instrumentation = protobug.enable_instrumentation()
+    instrumentation.callbacks.append(
+        lambda kind, py_type, size, start_ns, end_ns: spans.append((
+            kind,
+            py_type,
+            size,
+        ))
+    )
+    try:
+        protobug.loads(
+            b"\x00\x00\x22\x05hello\x2a\x03\x01\x02\x03", tests.model.Message4
+        )
+        protobug.dumps(tests.model.Message3(c=tests.model.Message1(a=150)))
+    finally:
+        assert protobug.disable_instrumentation() is instrumentation
+
+    protobug.loads(b"\x08\x96\x01", tests.model.Message1)
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot["decode"] == {
+        "tests.model.Message4": protobug.TypeStats(
+            calls=1,
+            bytes=14,
+            time_ns=snapshot["decode"]["tests.model.Message4"].time_ns,
+            fields=2,
+            unknown_fields=1,
+            packed_elements=3,
+        ),
+    }
+    assert set(snapshot["encode"]) == {"tests.model.Message1", "tests.model.Message3"}
+    assert snapshot["encode"]["tests.model.Message3"].bytes == 5
+    assert snapshot["encode"]["tests.model.Message3"].fields == 1
+    assert spans == [
+        ("decode", tests.model.Message4, 14),
+        ("encode", tests.model.Message1, 3),
+        ("encode", tests.model.Message3, 5),
+    ]
+
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {"decode": {}, "encode": {}}
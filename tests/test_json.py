@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import math
+import typing
+
+import pytest
+
+import protobug
+import tests.model
+
+
+@protobug.message
+class JsonMessage:
+    snake_case: protobug.Int64 = protobug.field(1)
+    raw: protobug.Bytes = protobug.field(2)
+    ratio: protobug.Double = protobug.field(3)
+    flag: protobug.Bool | None = protobug.field(4, default=None)
+    kind: tests.model.MessageEnum | None = protobug.field(5, default=None)
+    children: list[tests.model.Message1] = protobug.field(6, default_factory=list)
+    by_id: dict[protobug.UInt32, protobug.String] = protobug.field(
+        7, default_factory=dict
+    )
+
+
+def test_to_dict() -> None:
+    message = JsonMessage(
+        snake_case=1 << 40,
+        raw=b"\x00\xff",
+        ratio=math.inf,
+        kind=tests.model.MessageEnum.C,
+        children=[tests.model.Message1(a=1), tests.model.Message1()],
+        by_id={1: "one"},
+    )
+    expected = {
+        "snakeCase": "1099511627776",
+        "raw": "AP8=",
+        "ratio": "Infinity",
+        "kind": "C",
+        "children": [{"a": 1}, {}],
+        "byId": {"1": "one"},
+    }
+    assert protobug.to_dict(message) == expected
+    assert protobug.from_dict(expected, JsonMessage) == message
+    assert protobug.to_json(message) == "".join(protobug.iter_json(message))
+
+    message = JsonMessage(snake_case=0, raw=b"", ratio=0.0)
+    assert protobug.to_dict(message) == {"snakeCase": "0", "raw": "", "ratio": 0.0}
+
+
+def test_from_dict() -> None:
+    message = protobug.from_dict(
+        {
+            "snake_case": 5,
+            "raw": "AP-_",
+            "ratio": "NaN",
+            "flag": True,
+            "kind": 7,
+            "byId": {"2": "two"},
+        },
+        JsonMessage,
+    )
+    assert message.snake_case == 5
+    assert message.raw == b"\x00\xff\xbf"
+    assert math.isnan(message.ratio)
+    assert message.flag is True
+    assert message.kind == 7
+    assert message.by_id == {2: "two"}
+    assert protobug.to_dict(message)["kind"] == 7
+
+
+from_dict_errors = [
+    ({"unknown": 1}, ValueError("unknown field: 'unknown'")),
+    ({"kind": "D"}, ValueError("invalid MessageEnum value: 'D'")),
+    ({"flag": 1}, TypeError("invalid bool value: 1")),
+    ({"raw": "!!"}, ValueError("invalid base64 value")),
+]
+
+
+@pytest.mark.parametrize("data,error", from_dict_errors)
+def test_from_dict_errors(data: dict[str, typing.Any], error: Exception) -> None:
+    data = {"snakeCase": "1", "raw": "", "ratio": 1, **data}
+    with pytest.raises(type(error), match=error.args[0]):
+        protobug.from_dict(data, JsonMessage)
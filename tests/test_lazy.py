@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+import protobug
+import tests.model
+
+# the second item carries an unknown field and a non-minimal varint
+DATA = b"\x6a\x02\x08\x01\x6a\x05\x08\x82\x00\x18\x07\x6a\x00"
+
+
+def test_lazy_list() -> None:
+    message = protobug.loads(DATA, tests.model.Message11)
+    assert isinstance(message.n, protobug.LazyList)
+    assert len(message.n) == 3
+    assert message.n._items == [None, None, None]
+
+    assert message.n[-1] == tests.model.Message1()
+    assert message.n._items[:2] == [None, None]
+    assert message.n[1:] == [tests.model.Message1(a=2), tests.model.Message1()]
+    assert message.n._items[:2] == [None, None]
+    assert list(message.n.stream()) == [
+        tests.model.Message1(a=1),
+        tests.model.Message1(a=2),
+        tests.model.Message1(),
+    ]
+    assert message.n._items == [None, None, tests.model.Message1()]
+    assert list(message.n) == [
+        tests.model.Message1(a=1),
+        tests.model.Message1(a=2),
+        tests.model.Message1(),
+    ]
+    assert None not in message.n._items
+
+    with pytest.raises(IndexError):
+        message.n[3]
+
+    assert protobug.loads(b"", tests.model.Message11) == tests.model.Message11()
+    assert protobug.to_dict(message) == {"n": [{"a": 1}, {"a": 2}, {}]}
+
+
+def test_lazy_list_write() -> None:
+    message = protobug.loads(DATA, tests.model.Message11)
+    # untouched items are written back verbatim
+    assert protobug.dumps(message) == DATA
+    assert protobug.byte_size(message) == len(DATA)
+
+    message.n[0].a = 3
+    message.n.append(tests.model.Message1(a=4))
+    del message.n[2]
+    expected = b"\x6a\x02\x08\x03\x6a\x05\x08\x82\x00\x18\x07\x6a\x02\x08\x04"
+    assert protobug.dumps(message) == expected
+    assert protobug.byte_size(message) == len(expected)
+
+    message.n[1] = tests.model.Message1(a=5)
+    expected = b"\x6a\x02\x08\x03\x6a\x02\x08\x05\x6a\x02\x08\x04"
+    assert protobug.dumps(message) == expected
+
+    message = tests.model.Message11(n=protobug.LazyList([tests.model.Message1(a=1)]))
+    assert protobug.dumps(message) == b"\x6a\x02\x08\x01"
+
+    # changes made while iterating are kept
+    message = protobug.loads(DATA, tests.model.Message11)
+    for item in message.n:
+        item.a = 9
+    assert protobug.dumps(message) == (
+        b"\x6a\x02\x08\x09\x6a\x04\x08\x09\x18\x07\x6a\x02\x08\x09"
+    )
+
+
+def test_lazy_list_annotation() -> None:
+    with pytest.raises(TypeError, match="LazyList needs a message type"):
+
+        @protobug.message
+        class Invalid:
+            a: protobug.LazyList[protobug.Int32] = protobug.field(1)
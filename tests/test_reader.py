@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import concurrent.futures
 import io
+import pathlib
 import typing
 
 import pytest
@@ -137,10 +139,65 @@ def test_load(
 
 def test_unknown_read() -> None:
     result = protobug.loads(b"\x08\x96\x01", tests.model.Message1)
-    assert getattr(result, "_unknown") == {}
+    assert getattr(result, "_unknown") == b""
 
     result = protobug.loads(b"\x00\x00\x08\x96\x01\x00\x00", tests.model.Message1)
-    assert getattr(result, "_unknown") == {0: [0, 0]}
+    assert getattr(result, "_unknown") == b"\x00\x00\x00\x00"
+    assert protobug.loads(getattr(result, "_unknown")) == {0: [0, 0]}
+
+    other = protobug.loads(
+        b"\x12\x07testing\x1a\x03\x08\x96\x01\x25\x01\x02\x03\x04",
+        tests.model.Message2,
+    )
+    assert getattr(other, "_unknown") == b"\x1a\x03\x08\x96\x01\x25\x01\x02\x03\x04"
+
+    # non minimal varints are kept as they are
+    data = b"\x18\x82\x00\x98\x00\x01\x1a\x82\x00ab"
+    result = protobug.loads(data, tests.model.Message1)
+    assert getattr(result, "_unknown") == data
+    assert protobug.dumps(result) == data
+
+
+def test_fixed_roundtrip() -> None:
+    result = protobug.loads(b"\xa5\x01\xff\xff\xff\xff", tests.model.Message15)
+    assert result.u == (1 << 32) - 1
+    result = protobug.loads(b"\xb5\x01\xff\xff\xff\xff", tests.model.Message15)
+    assert result.w == -1
+
+    for u, v, w, x in [
+        (0, 0, 0, 0),
+        (1, 1, 1, 1),
+        (3_000_000_000, 1 << 63, -1, -1),
+        ((1 << 32) - 1, (1 << 64) - 1, -(1 << 31), -(1 << 63)),
+        (1 << 31, 1 << 32, (1 << 31) - 1, (1 << 63) - 1),
+    ]:
+        message = tests.model.Message15(u, v, w, x)
+        assert protobug.loads(protobug.dumps(message), tests.model.Message15) == message
+
+
+def test_negative_roundtrip() -> None:
+    for data in (b"\x08\xff\xff\xff\xff\x0f", b"\x08" + b"\xff" * 9 + b"\x01"):
+        assert protobug.loads(data, tests.model.Message1).a == -1
+
+    @protobug.message
+    class Signed:
+        a: protobug.Int32 = protobug.field(1)
+        b: protobug.Int64 = protobug.field(2)
+        c: tests.model.MessageEnum = protobug.field(3)
+
+    class Negative(protobug.Enum):
+        A = -1
+
+    @protobug.message
+    class SignedEnum:
+        c: Negative = protobug.field(1)
+
+    for a, b in [(-1, -1), (-(1 << 31), -(1 << 63)), ((1 << 31) - 1, (1 << 63) - 1)]:
+        message = Signed(a, b, tests.model.MessageEnum.C)
+        assert protobug.loads(protobug.dumps(message), Signed) == message
+
+    negative = SignedEnum(Negative.A)
+    assert protobug.loads(protobug.dumps(negative), SignedEnum) == negative
 
 
 def test_reader_behavior() -> None:
@@ -155,3 +212,112 @@ def test_reader_behavior() -> None:
         reader = protobug.Reader(buffer)
         assert reader.read_record() == (0, 0)
         assert buffer.tell() == 2
+
+
+def test_load_path(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "message.bin"
+    path.write_bytes(b"\x22\x05hello\x2a\x03\x01\x02\x03")
+    assert protobug.load_path(path, tests.model.Message4) == tests.model.Message4(
+        d="hello", e=[1, 2, 3]
+    )
+    assert protobug.load_path(path) == {4: [b"hello"], 5: [b"\x01\x02\x03"]}
+
+    path.write_bytes(b"")
+    assert protobug.load_path(path) == {}
+
+
+def test_load_nested() -> None:
+    # a chain of distinct types, deeper than the interpreter recursion limit allows
+    levels: list[type] = [tests.model.Message1]
+    for _ in range(1100):
+
+        class Level:
+            child: None = protobug.field(1, default=None)
+
+        Level.__annotations__["child"] = typing.Union[levels[-1], None]
+        levels.append(protobug.message(Level))
+
+    data = b"\x08\x01"
+    for _ in range(1100):
+        data = b"\x0a" + _varint(len(data)) + data
+
+    message: typing.Any = protobug.loads(data, levels[-1])
+    # writing does not recurse either
+    assert protobug.dumps(message) == data
+    assert protobug.dumps(protobug.loads(data, levels[-1], max_depth=1100)) == data
+    for _ in range(1100):
+        message = message.child
+    assert message == tests.model.Message1(a=1)
+
+    with pytest.raises(ValueError, match="maximum nesting depth exceeded: 100"):
+        protobug.loads(data, levels[-1], max_depth=100)
+
+    with pytest.raises(ValueError, match="maximum nesting depth exceeded: 0"):
+        protobug.loads(b"\x1a\x00", tests.model.Message3, max_depth=0)
+
+
+def _varint(value: int) -> bytes:
+    result = bytearray()
+    while value > 0x7F:
+        result.append(value & 0x7F | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def test_load_lazy_string() -> None:
+    data = b"\x72\x02\xce\xbb\x7a\x01a"
+    message = protobug.loads(data, tests.model.Message12)
+    assert vars(message) == {"o": b"\xce\xbb", "p": b"a", "_unknown": b""}
+    assert protobug.dumps(message) == data
+    assert protobug.byte_size(message) == len(data)
+
+    assert message.o == "λ"
+    assert vars(message)["o"] == "λ"
+    assert message == tests.model.Message12(o="λ", p="a")
+
+    message.p = "bc"
+    assert protobug.dumps(message) == b"\x72\x02\xce\xbb\x7a\x02bc"
+    assert protobug.loads(b"\x72\x00", tests.model.Message12).p is None
+
+    with pytest.raises(TypeError, match="lazy decoding needs a single String field"):
+
+        @protobug.message
+        class Invalid:
+            a: protobug.Bytes = protobug.field(1, lazy=True)
+
+
+def test_loads_parallel() -> None:
+    message = tests.model.Message13(
+        q=[tests.model.Message1(a=i) for i in range(300)], r=5
+    )
+    data = protobug.dumps(message) + b"\x18\x01"
+    result = protobug.loads(data, tests.model.Message13, parallel=2)
+    assert result == message
+    assert getattr(result, "_unknown") == b"\x18\x01"
+
+    # worker pools are reused between calls
+    executor = protobug._reader._EXECUTORS[2]
+    assert protobug.loads(data, tests.model.Message13, parallel=2) == message
+    assert protobug._reader._EXECUTORS[2] is executor
+
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        result = protobug.loads(data, tests.model.Message13, executor=pool)
+    assert result == message
+
+    # small fields are decoded in place
+    small = tests.model.Message13(q=[tests.model.Message1(a=1)], r=5)
+    assert (
+        protobug.loads(protobug.dumps(small), tests.model.Message13, parallel=2)
+        == small
+    )
+
+    # frozen maps are sent back from the workers as well
+    frozen = tests.model.Message16(
+        tuple(tests.model.Message14(t={"a": i}) for i in range(300))
+    )
+    frozen_result = protobug.loads(
+        protobug.dumps(frozen), tests.model.Message16, parallel=2
+    )
+    assert frozen_result == frozen
+    assert isinstance(frozen_result.y[0].t, protobug._core._FrozenDict)
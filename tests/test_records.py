@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+import pathlib
+
+import pytest
+
+import protobug
+import tests.model
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib", "lzma", "bz2"])
+def test_records(codec: str, tmp_path: pathlib.Path) -> None:
+    messages = [tests.model.Message2(b=f"record {i}") for i in range(10)]
+    path = tmp_path / "records.pbr"
+    with (
+        path.open("wb") as file,
+        protobug.RecordWriter(file, codec=codec, records_per_block=4) as writer,
+    ):
+        for message in messages:
+            writer.write(message)
+
+    with protobug.RecordReader(path, tests.model.Message2) as reader:
+        assert len(reader) == 10
+        assert reader.block_count == 3
+        assert reader[5] == messages[5]
+        assert reader[-1] == messages[-1]
+        assert reader[0] == messages[0]
+        assert list(reader) == messages
+        assert list(reader.iter_records(workers=2)) == messages
+        with pytest.raises(IndexError):
+            reader[10]
+
+
+def test_records_empty() -> None:
+    buffer = io.BytesIO()
+    protobug.RecordWriter(buffer).close()
+    reader = protobug.RecordReader(buffer.getvalue(), tests.model.Message2)
+    assert len(reader) == 0
+    assert list(reader) == []
+
+
+def test_records_codec() -> None:
+    protobug.register_codec(
+        "reversed", lambda data: data[::-1], lambda data: bytes(data)[::-1]
+    )
+    buffer = io.BytesIO()
+    with protobug.RecordWriter(buffer, codec="reversed") as writer:
+        writer.write(tests.model.Message1(a=1))
+    reader = protobug.RecordReader(buffer.getvalue(), tests.model.Message1)
+    assert list(reader) == [tests.model.Message1(a=1)]
+
+
+def test_records_errors() -> None:
+    with pytest.raises(ValueError, match="unknown codec: zstd"):
+        protobug.RecordWriter(io.BytesIO(), codec="zstd")
+
+    with pytest.raises(ValueError, match="not a protobug record file"):
+        protobug.RecordReader(b"PBR1", tests.model.Message1)
+
+    buffer = io.BytesIO()
+    with protobug.RecordWriter(buffer, codec="none") as writer:
+        writer.write(tests.model.Message1(a=1))
+    data = bytearray(buffer.getvalue())
+    data[6] ^= 1
+    reader = protobug.RecordReader(data, tests.model.Message1)
+    with pytest.raises(ValueError, match="record 0: checksum mismatch"):
+        reader[0]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+import protobug
+import tests.model
+
+
+def test_rewrite() -> None:
+    data = b"\x22\x05hello\x2a\x03\x01\x02\x03\x00\x00"
+    assert protobug.rewrite(data, tests.model.Message4, drop={4}) == (
+        b"\x2a\x03\x01\x02\x03\x00\x00"
+    )
+    assert protobug.rewrite(data, tests.model.Message4, replace={4: "bye"}) == (
+        b"\x22\x03bye\x2a\x03\x01\x02\x03\x00\x00"
+    )
+    assert protobug.rewrite(data, tests.model.Message4, replace={5: [7]}) == (
+        b"\x22\x05hello\x28\x07\x00\x00"
+    )
+    assert protobug.rewrite(data, tests.model.Message4, replace={4: None}) == (
+        b"\x2a\x03\x01\x02\x03\x00\x00"
+    )
+    assert protobug.rewrite(b"", tests.model.Message4, replace={4: "new"}) == (
+        b"\x22\x03new"
+    )
+
+
+def test_rewrite_nested() -> None:
+    data = b"\x1a\x05\x08\x96\x01\x00\x00\x1a\x02\x08\x01"
+    assert protobug.rewrite(data, tests.model.Message3, drop={(3, 1)}) == (
+        b"\x1a\x02\x00\x00\x1a\x00"
+    )
+    assert protobug.rewrite(data, tests.model.Message3, replace={(3, 1): 5}) == (
+        b"\x1a\x04\x08\x05\x00\x00\x1a\x02\x08\x05"
+    )
+    assert protobug.rewrite(data, tests.model.Message3) == data
+
+    # missing parents are created for replacements, but not for drops
+    assert protobug.rewrite(b"", tests.model.Message3, replace={(3, 1): 5}) == (
+        b"\x1a\x02\x08\x05"
+    )
+    assert protobug.rewrite(b"", tests.model.Message3, drop={(3, 1)}) == b""
+    with pytest.raises(
+        ValueError, match="cannot replace fields of a missing repeated message"
+    ):
+        protobug.rewrite(b"", tests.model.Message13, replace={(16, 1): 5})
+    assert protobug.rewrite(
+        b"\x82\x01\x00", tests.model.Message13, replace={(16, 1): 5}
+    ) == (b"\x82\x01\x02\x08\x05")
+
+
+rewrite_errors = [
+    ({"drop": {9}}, ValueError("unknown field id: 9")),
+    ({"drop": {(4, 1)}}, ValueError("Message4.d: not a message field")),
+    ({"drop": {4}, "replace": {4: ""}}, ValueError("cannot both drop and replace")),
+    ({"drop": {()}}, ValueError("empty field path")),
+]
+
+
+@pytest.mark.parametrize("kwargs,error", rewrite_errors)
+def test_rewrite_errors(kwargs: dict, error: Exception) -> None:
+    with pytest.raises(type(error), match=error.args[0]):
+        protobug.rewrite(b"", tests.model.Message4, **kwargs)
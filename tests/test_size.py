@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+import protobug
+import tests.model
+import tests.test_writer
+
+
+@pytest.mark.parametrize(
+    "data,expected,msg",
+    tests.test_writer.test_data,
+    ids=[test[-1] for test in tests.test_writer.test_data],
+)
+def test_byte_size(data: typing.Any, expected: bytes, msg: str) -> None:
+    assert protobug.byte_size(data) == len(expected)
+
+
+def test_byte_size_cache() -> None:
+    inner = tests.model.Message1(a=-1)
+    message = tests.model.Message3(c=inner)
+    sizes: dict[int, tuple[typing.Any, int]] = {}
+    assert protobug.byte_size(message, sizes=sizes) == 8
+    assert sizes == {id(inner): (inner, 6), id(message): (message, 8)}
+    assert protobug.dumps(message, sizes=sizes) == protobug.dumps(message)
+
+    # entries of other objects with the same id are ignored
+    sizes = {id(inner): (tests.model.Message1(a=1), 2)}
+    assert protobug.byte_size(message, sizes=sizes) == 8
+    assert sizes[id(inner)] == (inner, 6)
+
+    other = protobug.loads(b"\x12\x02\xce\xbb\x08\x01", tests.model.Message2)
+    assert other.b == "λ"
+    assert protobug.byte_size(other) == 6
+
+    with pytest.raises(TypeError, match="not a valid protobuf type"):
+        protobug.byte_size(1)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+import protobug
+
+
+@protobug.message(cache_encoding=True)
+class Leaf:
+    a: protobug.Int32 = protobug.field(1)
+    b: list[protobug.Int32] = protobug.field(2, default_factory=list)
+
+
+@protobug.message(cache_encoding=True)
+class Root:
+    leaf: typing.Union[Leaf, None] = protobug.field(1, default=None)
+    leaves: dict[protobug.String, Leaf] = protobug.field(2, default_factory=dict)
+    name: typing.Union[protobug.String, None] = protobug.field(3, default=None)
+
+
+def test_cache_encoding() -> None:
+    leaf = Leaf(1)
+    root = Root(leaf=leaf, leaves={"x": Leaf(2)})
+    data = protobug.dumps(root)
+    assert vars(root)["_encoded"] == data
+    assert vars(leaf)["_encoded"] == b"\x08\x01"
+    assert protobug.byte_size(root) == len(data)
+    assert protobug.dumps(root) == data
+
+    # changes propagate to every cached parent
+    leaf.b.append(3)
+    assert vars(leaf)["_encoded"] is None
+    assert vars(root)["_encoded"] is None
+    assert protobug.loads(protobug.dumps(root), Root) == root
+
+    root.leaves["x"].a = 4
+    assert vars(root)["_encoded"] is None
+    assert protobug.loads(protobug.dumps(root), Root).leaves["x"].a == 4
+
+    root.leaves["y"] = Leaf(5)
+    root.name = "root"
+    expected = protobug.dumps(root)
+    assert protobug.loads(expected, Root) == root
+
+    # untouched subtrees are spliced in from their cached bytes
+    vars(leaf)["_encoded"] = b"\x08\x07"
+    root.name = None
+    assert protobug.loads(protobug.dumps(root), Root).leaf == Leaf(7)
+
+
+def test_cache_encoding_errors() -> None:
+    @protobug.message
+    class Plain:
+        a: protobug.Int32 = protobug.field(1)
+
+    with pytest.raises(TypeError, match="Plain needs cache_encoding as well"):
+
+        @protobug.message(cache_encoding=True)
+        class Invalid:
+            plain: Plain = protobug.field(1)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pytest
+
+import protobug
+
+
+def test_loads_tree() -> None:
+    data = (
+        b"\x08\x96\x01\x12\x07testing\x1a\x05\x08\x96\x01\x10\x01\x25\x01\x00\x00\x00"
+    )
+    tree = protobug.loads_tree(data)
+    assert tree == {
+        1: [150],
+        2: [protobug.RawField(b"testing")],
+        3: [protobug.RawField(b"\x08\x96\x01\x10\x01")],
+        4: [b"\x01\x00\x00\x00"],
+    }
+
+    string, embed = tree[2][0], tree[3][0]
+    assert isinstance(string, protobug.RawField)
+    assert isinstance(embed, protobug.RawField)
+    assert string.as_string() == "testing"
+    assert not string.looks_like_message()
+    assert embed.looks_like_message()
+    assert embed.as_message() == {1: [150], 2: [1]}
+    assert embed.as_message() is embed.as_message()
+    assert embed.as_packed(protobug.ProtoType.UInt32) == [8, 150, 16, 1]
+    assert protobug.RawField(b"\x01\x00\x00\x00").as_packed(
+        protobug.ProtoType.Fixed32
+    ) == [1]
+
+    with pytest.raises(ValueError, match="not enough data: expected 4, got 1"):
+        embed.as_packed(protobug.ProtoType.Fixed32)
+
+    with pytest.raises(TypeError, match="String cannot be packed"):
+        embed.as_packed(protobug.ProtoType.String)
+
+    with pytest.raises(ValueError, match="not enough data"):
+        protobug.loads_tree(b"\x12\x07test")
+
+
+looks_like_message_tests = [
+    (b"", True),
+    (b"\x08\x96\x01", True),
+    (b"\x1a\x03\x08\x96\x01\x25\x01\x00\x00\x00", True),
+    (b"\x00\x00", False),
+    (b"\x08\x96", False),
+    (b"\x12\x07test", False),
+    (b"\x0b\x00", False),
+    (b"testing", False),
+]
+
+
+@pytest.mark.parametrize("data,expected", looks_like_message_tests)
+def test_looks_like_message(data: bytes, expected: bool) -> None:
+    assert protobug.looks_like_message(data) is expected
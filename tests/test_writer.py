@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import io
+import itertools
 import typing
 
 import pytest
@@ -93,3 +94,148 @@ def test_writer_behavior() -> None:
     with io.BytesIO() as buffer:
         protobug.dump(tests.model.Message1(), buffer)
         assert not buffer.closed, "buffer should not be closed after a dump"
+
+
+def test_dumps_many() -> None:
+    messages = [
+        tests.model.Message1(a=150),
+        tests.model.Message1(),
+        tests.model.Message2(b="testing"),
+    ]
+    buffer, offsets = protobug.dumps_many(messages)
+    assert buffer == b"\x08\x96\x01\x12\x07testing"
+    assert offsets.tolist() == [0, 3, 3, 12]
+    assert [bytes(buffer[start:end]) for start, end in itertools.pairwise(offsets)] == [
+        protobug.dumps(message) for message in messages
+    ]
+
+
+def test_unknown_write() -> None:
+    data = b"\x00\x00\x08\x96\x01\x1a\x03\x08\x96\x01\x2d\x01\x02\x03\x04"
+    result = protobug.loads(data, tests.model.Message1)
+    assert (
+        protobug.dumps(result)
+        == b"\x08\x96\x01\x00\x00\x1a\x03\x08\x96\x01\x2d\x01\x02\x03\x04"
+    )
+
+    result.a = 1
+    assert (
+        protobug.dumps(result)
+        == b"\x08\x01\x00\x00\x1a\x03\x08\x96\x01\x2d\x01\x02\x03\x04"
+    )
+
+
+validation_tests = [
+    (
+        tests.model.Message1(a=1 << 31),
+        ValueError("a: value out of range for Int32: 2147483648"),
+        "int32 overflow should be rejected",
+    ),
+    (
+        tests.model.Message5(f=[1, 2, -(1 << 31) - 1]),
+        ValueError("f: value out of range for Int32: -2147483649"),
+        "packed int32 overflow should be rejected",
+    ),
+    (
+        tests.model.Message2(b=b"testing"),  # type: ignore
+        TypeError("b: expected String value, got bytes"),
+        "bytes for string should be rejected",
+    ),
+    (
+        tests.model.Message8(i=1),
+        TypeError("i: expected Float value, got int"),
+        "int for float should be rejected",
+    ),
+    (
+        tests.model.Message6(g={"a": -1}),
+        ValueError("value: value out of range for UInt32: -1"),
+        "negative map value should be rejected",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "data,error",
+    [test[:-1] for test in validation_tests],
+    ids=[test[-1] for test in validation_tests],
+)
+def test_dump_validation(data: typing.Any, error: Exception) -> None:
+    with pytest.raises(type(error), match=error.args[0]):
+        protobug.dumps(data)
+
+
+def test_dump_trusted() -> None:
+    for data, expected, _ in test_data:
+        assert protobug.dumps(data, trusted=True) == expected
+
+    # trusted mode skips validation entirely
+    assert protobug.dumps(tests.model.Message5(f=[1 << 32]), trusted=True) == (
+        b"\x30\x80\x80\x80\x80\x10"
+    )
+
+
+def test_dumps_chunks() -> None:
+    payload = b"x" * 16
+    view = memoryview(bytearray(b"y" * 32))
+    message = tests.model.Message10(
+        k=payload,
+        m=tests.model.Message9(j=view),  # type: ignore
+    )
+    chunks = protobug.dumps_chunks(message, threshold=16)
+    assert b"".join(chunks) == protobug.dumps(message)
+    assert chunks[1] is payload
+    assert chunks[3] is view
+    assert chunks == [b"\x5a\x10", payload, b"\x62\x22\x52\x20", view]
+
+    assert protobug.dumps_chunks(tests.model.Message1(a=150)) == [b"\x08\x96\x01"]
+    assert protobug.dumps_chunks(tests.model.Message1()) == []
+
+
+def test_dump_into() -> None:
+    message = tests.model.Message3(c=tests.model.Message1(a=150))
+    buffer = bytearray(8)
+    assert protobug.dump_into(message, buffer, 2) == 5
+    assert buffer == b"\x00\x00\x1a\x03\x08\x96\x01\x00"
+
+    view = memoryview(buffer)[1:6]
+    assert protobug.dump_into(message, view) == 5
+    assert buffer == b"\x00\x1a\x03\x08\x96\x01\x01\x00"
+
+    with pytest.raises(ValueError, match="not enough space: expected 5, got 4"):
+        protobug.dump_into(message, buffer, 4)
+
+    with pytest.raises(ValueError, match="not enough space: expected 5, got 0"):
+        protobug.dump_into(message, buffer, 10)
+
+    with pytest.raises(TypeError, match="read-only"):
+        protobug.dump_into(message, memoryview(bytes(8)))
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: typing.Any) -> int:
+        self.data += data
+        return len(data)
+
+
+def test_dump_streaming() -> None:
+    message = tests.model.Message3(c=tests.model.Message1(a=150))
+    expected = b"\x1a\x83\x80\x80\x80\x00\x08\x96\x01"
+
+    buffer = io.BytesIO()
+    assert protobug.dump(message, buffer, streaming=True) == len(expected)
+    assert buffer.getvalue() == expected
+    assert protobug.loads(expected, tests.model.Message3) == message
+
+    unseekable = _Unseekable()
+    writer = typing.cast("io.BufferedIOBase", unseekable)
+    assert protobug.dump(message, writer, streaming=True) == len(expected)
+    assert unseekable.data == expected
+
+    with pytest.raises(ValueError, match="streaming needs a seekable output"):
+        protobug.Writer(writer, streaming=True)